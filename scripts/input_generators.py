@@ -0,0 +1,103 @@
+"""
+Synthetic puzzle input generators for scaling benchmarks (see `run.py scale`).
+
+Each generator takes a size `n` and a seeded `random.Random` and returns the lines of a valid puzzle input.
+What `n` measures is up to the day (grid side, number of ranges, number of valves, ...) and is noted on each one.
+Register a new day with the `generator(year, day)` decorator.
+"""
+
+import random
+from itertools import product
+from typing import Callable
+
+Generator = Callable[[int, random.Random], list[str]]
+
+GENERATORS: dict[tuple[int, int], Generator] = {}
+
+
+def generator(year: int, day: int) -> Callable[[Generator], Generator]:
+    def register(fn: Generator) -> Generator:
+        GENERATORS[(year, day)] = fn
+        return fn
+    return register
+
+
+def _valve_name(index: int) -> str:
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return letters[index // 26 % 26] + letters[index % 26]
+
+
+@generator(2022, 16)
+def valve_graph(n: int, rng: random.Random) -> list[str]:
+    """
+    n valves (at most 676) in a connected tunnel network starting at AA, about a third of them with a flow rate.
+    """
+    if not 2 <= n <= 26 * 26:
+        raise ValueError("valve graphs need between 2 and 676 valves")
+    names = [_valve_name(i) for i in range(n)]
+    tunnels = {name: set() for name in names}
+    for i in range(1, n):  # a random spanning tree keeps every valve reachable from AA
+        a, b = names[i], names[rng.randrange(i)]
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+    for _ in range(n // 2):
+        a, b = rng.sample(names, 2)
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+    lines = []
+    for name in names:
+        rate = rng.randint(1, 25) if name != "AA" and rng.random() < 1 / 3 else 0
+        targets = sorted(tunnels[name])
+        if len(targets) == 1:
+            lines.append(f"Valve {name} has flow rate={rate}; tunnel leads to valve {targets[0]}")
+        else:
+            lines.append(f"Valve {name} has flow rate={rate}; tunnels lead to valves {', '.join(targets)}")
+    return lines
+
+
+def _guard_escapes(obstacles: set[tuple[int, int]], start: tuple[int, int], size: int) -> bool:
+    (i, j), (di, dj) = start, (-1, 0)
+    seen = set()
+    while 0 <= i < size and 0 <= j < size:
+        if (i, j, di, dj) in seen:
+            return False
+        seen.add((i, j, di, dj))
+        if (i + di, j + dj) in obstacles:
+            di, dj = dj, -di
+        else:
+            i, j = i + di, j + dj
+    return True
+
+
+@generator(2024, 6)
+def guard_map(n: int, rng: random.Random) -> list[str]:
+    """
+    An n x n lab map with ~10% obstacles and a guard whose patrol leaves the map (as the puzzle guarantees).
+    """
+    if n < 2:
+        raise ValueError("guard maps need a side of at least 2")
+    cells = list(product(range(n), repeat=2))
+    while True:
+        obstacles = {cell for cell in cells if rng.random() < 0.1}
+        start = rng.choice(cells)
+        obstacles.discard(start)
+        if _guard_escapes(obstacles, start, n):
+            break
+    grid = [["#" if (i, j) in obstacles else "." for j in range(n)] for i in range(n)]
+    grid[start[0]][start[1]] = "^"
+    return ["".join(row) for row in grid]
+
+
+@generator(2025, 5)
+def ingredient_ranges(n: int, rng: random.Random) -> list[str]:
+    """
+    n overlapping fresh-ingredient ID ranges followed by n ingredient IDs to check.
+    """
+    span = 1_000_000 * n
+    lines = []
+    for _ in range(n):
+        start = rng.randrange(span)
+        lines.append(f"{start}-{start + rng.randrange(1, span // n * 4)}")
+    lines.append("")
+    lines.extend(str(rng.randrange(span)) for _ in range(n))
+    return lines
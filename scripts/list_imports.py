@@ -1,11 +1,26 @@
 #!/usr/bin/env python3
 
 import ast
+import os
+import re
+import subprocess
+import sys
 from collections import Counter
 from pathlib import Path
 
 PROJECT_DIRS = [f"aoc_{year}" for year in range(2018, 2026)]
 
+# imports a solution file by path, like the runner does, so -X importtime sees every module it pulls in;
+# the marker separates the solution's imports from interpreter startup
+SOLUTION_MARKER = "--- importing solution ---"
+IMPORT_SOLUTION = f"""
+import sys
+from importlib.util import module_from_spec, spec_from_file_location
+spec = spec_from_file_location("solution", sys.argv[1])
+print("{SOLUTION_MARKER}", file=sys.stderr, flush=True)
+spec.loader.exec_module(module_from_spec(spec))
+"""
+
 def find_python_files(root: Path):
     for subdir in PROJECT_DIRS:
         subpath = root / subdir
@@ -34,11 +49,63 @@ def extract_imports_from_file(path: Path):
     return imports
 
 
+def measure_import_times(solution_path: Path, src_dir: Path) -> dict[str, int] | None:
+    """
+    Imports the solution in a fresh interpreter with `-X importtime`. Returns the cumulative import time in
+    microseconds of each module the solution pulls in directly (plus "<total>"), or None if the import failed.
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(src_dir), os.environ.get("PYTHONPATH")]))}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SOLUTION, str(solution_path)],
+        capture_output=True, text=True, env=env,
+    )
+    if proc.returncode != 0:
+        return None
+
+    # lines look like "import time:       123 |       4567 |   numpy.core"; nesting is shown by indentation,
+    # and a module's line comes after those of everything it imports
+    times = {}
+    for line in proc.stderr.partition(SOLUTION_MARKER)[2].splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$", line)
+        if m is not None and len(m.group(3)) == 1:
+            times[m.group(4)] = int(m.group(2))
+    times["<total>"] = sum(times.values())
+    return times
+
+
+def profile_imports(project_root: Path, years: list[str]) -> None:
+    """Prints the real import cost of every day's solution and the modules that account for it."""
+    src_dir = project_root / "src"
+    module_costs = {}
+    for subdir in years:
+        for solution_path in sorted((src_dir / subdir).glob("day_*/solution.py")):
+            day = f"{subdir}/{solution_path.parent.name}"
+            times = measure_import_times(solution_path, src_dir)
+            if times is None:
+                print(f"{day}: import failed")
+                continue
+            total = times.pop("<total>")
+            top = sorted(times.items(), key=lambda item: item[1], reverse=True)[:3]
+            print(f"{day}: {total / 1000:8.1f} ms  " + ", ".join(f"{mod} {us / 1000:.1f} ms" for mod, us in top))
+            for mod, us in times.items():
+                module_costs.setdefault(mod, []).append(us)
+
+    print("\n=== Modules by total import cost across days ===")
+    for mod, costs in sorted(module_costs.items(), key=lambda item: sum(item[1]), reverse=True)[:20]:
+        print(f"{sum(costs) / 1000:9.1f} ms  {len(costs):3} days  {mod}")
+
+
 def main():
     project_root = Path(__file__).resolve().parent.parent
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--profile":
+        years = [f"aoc_{year}" for year in sys.argv[2:]] or PROJECT_DIRS
+        profile_imports(project_root, years)
+        return
+
     import_counter = Counter()
 
-    for py_file in find_python_files(project_root):
+    for py_file in find_python_files(project_root / "src"):
         file_imports = extract_imports_from_file(py_file)
         import_counter.update(file_imports)
 
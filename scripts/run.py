@@ -1,165 +1,50 @@
 #!/usr/bin/env python3
+import asyncio
+import json
+import os
 import re
+import statistics
 import sys
-import time
-import traceback
-from importlib.util import module_from_spec, spec_from_file_location
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Callable
 
 import click
-
-
-def _read_puzzle_input(base_dir: Path, filename: str) -> list[str] | None:
-
-    filepath = base_dir / filename
-    if not filepath.exists():
-        print(f"{filename} not found.")
-        return None
-
-    try:
-        puzzle_input = filepath.read_text().splitlines()
-        return puzzle_input
-    except Exception as exc:
-        print(f"Failed to read {filepath}: {exc}")
-        return None
-
-
-def _run_test_case(num: int, puzzle_input: list[str], solve_fn: Callable) -> None:
-    try:
-        t0 = time.time()
-        result = solve_fn(puzzle_input)
-        t1 = time.time()
-        print(f"Part {num}: {result}")
-        print(f"({(t1 - t0):.3} seconds)")
-    except Exception:
-        print(f"Part {num}: ERROR")
-        traceback.print_exc()
-
-
-def load_solution_module(year: int, day: int) -> tuple[Callable, Callable]:
-    solution_path = Path(f"src/aoc_{year}/day_{day:02d}/solution.py").resolve()
-    if not solution_path.exists():
-        raise FileNotFoundError(f"{solution_path} does not exist")
-
-    module_name = f"aoc_{year}_day_{day:02d}_solution"
-    spec = spec_from_file_location(module_name, solution_path)
-    if spec is None or spec.loader is None:
-        raise ImportError(f"Couldn't create import spec for {solution_path}")
-    module = module_from_spec(spec)  # type: ignore
-
-    try:
-        sys.modules[module_name] = module
-        spec.loader.exec_module(module)  # type: ignore
-    except Exception as exc:
-        # cleanup any partially-registered module to avoid confusing subsequent imports
-        sys.modules.pop(module_name, None)
-        raise RuntimeError(f"Failed to import {solution_path}: {exc}")
-
-    if not hasattr(module, "solve_part_1") or not hasattr(module, "solve_part_2"):
-        raise AttributeError(f"{module_name} missing solve_part_1/solve_part_2")
-
-    if not callable(module.solve_part_1) or not callable(module.solve_part_2):
-        raise TypeError("solve_part_1 and solve_part_2 must be callable")
-
-    return module.solve_part_1, module.solve_part_2
-
-
-def _run_day(
-        year: int,
-        day: int,
-        skip_example: bool = False,
-        skip_puzzle: bool = False,
-        part1_only: bool = False,
-        part2_only: bool = False,
-) -> None:
-    """Runs the solution for a single day."""
-    base_dir = Path(__file__).parent.parent / "src" / f"aoc_{year}" / f"day_{day:02d}"
-    if not base_dir.exists():
-        print(f"Day directory {base_dir} does not exist")
-        return
-    
-    input_dir = base_dir / "input"
-    if not input_dir.exists():
-        print(f"Input directory {input_dir} does not exist")
-        return
-
-    print(f"\n=== Day {day:02d} ===\n")
-
-    try:
-        solve_part_1, solve_part_2 = load_solution_module(year, day)
-    except Exception as exc:
-        print(f"Skipping day {day:02d}: {exc}")
-        return
-
-    if not skip_example:
-        example_files = sorted([p.name for p in input_dir.glob("*example*.txt")])
-        if not example_files:
-            print("No example files found.")
-        for example_file in example_files:
-            print(f"--- Example ({example_file}) ---")
-            puzzle_input = _read_puzzle_input(input_dir, example_file)
-            if puzzle_input is not None:
-                if not part2_only:
-                    _run_test_case(1, puzzle_input, solve_part_1)
-                if not part1_only:
-                    _run_test_case(2, puzzle_input, solve_part_2) 
-
-    if not skip_puzzle:
-        puzzle_file = "puzzle.txt"
-        print(f"--- Puzzle ({puzzle_file}) ---")
-        puzzle_input = _read_puzzle_input(input_dir, puzzle_file)
-        if puzzle_input is not None:
-            if not part2_only:
-                _run_test_case(1, puzzle_input, solve_part_1)
-            if not part1_only:
-                _run_test_case(2, puzzle_input, solve_part_2)
-
-
-def _run_year(
-        year: int,
-        skip_example: bool = False,
-        skip_puzzle: bool = False,
-        part1_only: bool = False,
-        part2_only: bool = False,
-) -> None:
-    year_dir = Path(__file__).parent.parent / "src" / f"aoc_{year}"
-    if not year_dir.exists():
-        print(f"Year directory {year_dir} does not exist")
-        return
-
-    day_dirs = sorted([d for d in year_dir.iterdir() if d.is_dir() and re.match(r"day_\d{2}$", d.name)])
-    if not day_dirs:
-        print(f"No directories were found matching {year_dir}/day_DD/")
-        return
-
-    for day_dir in day_dirs:
-        m = re.match(r"day_(\d{2})$", day_dir.name)
-        if not m:
-            continue
-        day = int(m.group(1))
-        _run_day(year, day, skip_example, skip_puzzle, part1_only, part2_only)
-
-
-def _run_all(
-        skip_example: bool = False,
-        skip_puzzle: bool = False,
-        part1_only: bool = False,
-        part2_only: bool = False,
-) -> None:
-    root_dir = Path(__file__).parent.parent / "src"
-
-    year_dirs = sorted([d for d in root_dir.iterdir() if d.is_dir() and re.match(r"aoc_\d{4}$", d.name)])
-    if not year_dirs:
-        print("No directories were found matching aoc_YYYY/")
-        return
-
-    for year_dir in year_dirs:
-        m = re.match(r"aoc_(\d{4})$", year_dir.name)
-        if not m:
-            continue
-        year = int(m.group(1))
-        _run_year(year, skip_example, skip_puzzle, part1_only, part2_only)
+from input_generators import GENERATORS
+from runner.benchmark import (
+    BASELINE_FILE,
+    benchmark_unit,
+    compare_to_baseline,
+    fit_exponent,
+    format_ns,
+    interleaved_timings,
+    load_baseline,
+    print_benchmark,
+    save_baseline,
+    scale_day,
+    speedup_interval,
+    write_jsonl,
+)
+from runner.cache import CACHE_DIR
+from runner.corpus import print_corpus_record, run_corpus_file
+from runner.daemon import SOCKET_PATH, send_request, serve
+from runner.execution import execute_plan, no_nested_parallelism, print_result, run_all, run_day, run_year
+from runner.plan import plan_for
+from runner.profiling import PROFILE_DIR
+from runner.report import report_slowest
+from runner.shard import result_order
+from runner.solutions import (
+    day_dir,
+    find_solution_variants,
+    get_solution,
+    load_solution_module,
+    module_two_phase_parse,
+    read_puzzle_input,
+    solution_module_name,
+)
+from runner.watch import watch_day
 
 
 @click.group()
@@ -175,7 +60,7 @@ def _validate_flags(skip_example: bool, skip_puzzle: bool, part1_only: bool, par
     if part1_only and part2_only:
         print("Error: --part1-only and --part2-only are mutually exclusive.")
         raise SystemExit(2)
-    
+
 
 COMMON_OPTIONS = [
     click.option("-se", "--skip-example", "skip_example", is_flag=True, default=False),
@@ -193,28 +78,504 @@ def apply_options(options):
     return decorator
 
 
+# options that change how each unit is run, forwarded to `run_unit`
+RUN_OPTIONS = [
+    click.option("-m", "--memory", "memory", is_flag=True, default=False,
+                 help="Report peak traced allocation, RSS growth and top allocation sites per part."),
+    click.option("-P", "--profile", "profile", is_flag=True, default=False,
+                 help=f"Profile each part, saving a .pstats file per part under {PROFILE_DIR.name}/."),
+    click.option("--sample", "sample", is_flag=True, default=False,
+                 help="With --profile, sample the stack periodically instead of tracing every call."),
+    click.option("--profile-top", "profile_top", type=int, default=10, show_default=True,
+                 help="Number of functions to list by cumulative and by own time."),
+    click.option("-c", "--counters", "counters", is_flag=True, default=False,
+                 help="Count heap operations, settled nodes, neighbor expansions, range merges, grid reads/writes, "
+                      "cells scanned by bulk grid operations and numpy views inside aoc_utils."),
+    click.option("--cache/--no-cache", "cache", default=True, show_default=True,
+                 help=f"Reuse answers from {CACHE_DIR.name}/ when the solution, aoc_utils and input are unchanged."),
+]
+
+
+TIMEOUT_OPTION = click.option(
+    "-T", "--timeout", "timeout", type=float, default=None,
+    help="Run each part in a worker subprocess and kill it after this many seconds.",
+)
+
+
+def _validate_timeout(timeout: float | None) -> None:
+    if timeout is not None and timeout <= 0:
+        print("Error: --timeout must be positive.")
+        raise SystemExit(2)
+
+
 @cli.command(name="run")
 @click.argument("year", type=int)
 @click.argument("day", type=int)
 @apply_options(COMMON_OPTIONS)
-def run_cmd(year: int, day: int, skip_example: bool, skip_puzzle: bool, part1_only: bool, part2_only: bool) -> None:
+@TIMEOUT_OPTION
+@apply_options(RUN_OPTIONS)
+def run_cmd(
+        year: int, day: int, skip_example: bool, skip_puzzle: bool, part1_only: bool, part2_only: bool,
+        timeout: float | None, **unit_options,
+) -> None:
     _validate_flags(skip_example, skip_puzzle, part1_only, part2_only)
-    _run_day(year, day, skip_example, skip_puzzle, part1_only, part2_only)
+    _validate_timeout(timeout)
+    run_day(year, day, skip_example, skip_puzzle, part1_only, part2_only, timeout, **unit_options)
+
+
+JOBS_OPTION = click.option(
+    "-j", "--jobs", "jobs", type=int, default=1,
+    help="Number of worker processes (0 uses every CPU).",
+)
+
+
+def _resolve_jobs(jobs: int) -> int:
+    if jobs < 0:
+        print("Error: --jobs must be non-negative.")
+        raise SystemExit(2)
+    return jobs or os.cpu_count() or 1
+
+
+def _parse_shard(ctx: click.Context, param: click.Parameter, value: str | None) -> tuple[int, int] | None:
+    if value is None:
+        return None
+    match = re.fullmatch(r"(\d+)/(\d+)", value)
+    if match is None or not 1 <= int(match[1]) <= int(match[2]):
+        raise click.BadParameter("expected I/N with 1 <= I <= N, e.g. 2/4")
+    return int(match[1]), int(match[2])
+
+
+SHARD_OPTIONS = [
+    click.option("--shard", "shard", callback=_parse_shard, default=None, metavar="I/N",
+                 help="Only run the I-th of N shards (1-based). Inputs are split deterministically, balanced by "
+                      "the baseline's runtimes when it has them and round-robin otherwise."),
+    click.option("-b", "--baseline", "baseline_path", type=click.Path(dir_okay=False, path_type=Path),
+                 default=BASELINE_FILE, show_default=True, help="Baseline file used to balance shards."),
+    click.option("--json", "json_path", type=click.Path(dir_okay=False, path_type=Path), default=None,
+                 help="Write the results to this file as JSON (combine shards with `merge`)."),
+]
+
+
+def _validate_report(budget: float, report_top: int) -> None:
+    if budget <= 0 or report_top < 0:
+        print("Error: --budget must be positive and --top non-negative.")
+        raise SystemExit(2)
+
+
+REPORT_OPTIONS = [
+    click.option("--budget", "budget", type=float, default=1.0, show_default=True,
+                 help="Per-part time budget in seconds; slower parts are flagged in the slowest-parts report."),
+    click.option("--top", "report_top", type=int, default=10, show_default=True,
+                 help="Parts to list in the slowest-parts report (0 for all); parts over budget are always listed."),
+    click.option("--report-json", "report_json", type=click.Path(dir_okay=False, path_type=Path), default=None,
+                 help="Write the full slowest-parts ranking to this file as JSON."),
+]
 
 
 @cli.command(name="run-year")
 @click.argument("year", type=int)
 @apply_options(COMMON_OPTIONS)
-def run_year_cmd(year: int, skip_example: bool, skip_puzzle: bool, part1_only: bool, part2_only: bool) -> None:
+@JOBS_OPTION
+@TIMEOUT_OPTION
+@apply_options(SHARD_OPTIONS)
+@apply_options(REPORT_OPTIONS)
+@apply_options(RUN_OPTIONS)
+def run_year_cmd(
+        year: int, skip_example: bool, skip_puzzle: bool, part1_only: bool, part2_only: bool, jobs: int,
+        timeout: float | None, **options,
+) -> None:
     _validate_flags(skip_example, skip_puzzle, part1_only, part2_only)
-    _run_year(year, skip_example, skip_puzzle, part1_only, part2_only)
+    _validate_timeout(timeout)
+    _validate_report(options["budget"], options["report_top"])
+    run_year(year, skip_example, skip_puzzle, part1_only, part2_only, _resolve_jobs(jobs), timeout, **options)
 
 
 @cli.command(name="run-all")
 @apply_options(COMMON_OPTIONS)
-def run_all_cmd(skip_example: bool, skip_puzzle: bool, part1_only: bool, part2_only: bool) -> None:
+@JOBS_OPTION
+@TIMEOUT_OPTION
+@apply_options(SHARD_OPTIONS)
+@apply_options(REPORT_OPTIONS)
+@apply_options(RUN_OPTIONS)
+def run_all_cmd(
+        skip_example: bool, skip_puzzle: bool, part1_only: bool, part2_only: bool, jobs: int, timeout: float | None,
+        **options,
+) -> None:
     _validate_flags(skip_example, skip_puzzle, part1_only, part2_only)
-    _run_all(skip_example, skip_puzzle, part1_only, part2_only)
+    _validate_timeout(timeout)
+    _validate_report(options["budget"], options["report_top"])
+    run_all(skip_example, skip_puzzle, part1_only, part2_only, _resolve_jobs(jobs), timeout, **options)
+
+
+@cli.command(name="merge")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("-o", "--output", "output", type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help="Also write the combined results to this file as JSON.")
+@apply_options(REPORT_OPTIONS)
+def merge_cmd(
+        paths: tuple[Path, ...], output: Path | None, budget: float, report_top: int, report_json: Path | None,
+) -> None:
+    """
+    Combines the --json results of sharded runs into one report. Exits non-zero if a shard is missing or
+    duplicated, or if any part failed or timed out.
+    """
+    _validate_report(budget, report_top)
+    runs = [json.loads(path.read_text()) for path in paths]
+    results = sorted((r for run in runs for r in run["results"]), key=result_order)
+    last = None
+    for result in results:
+        if (result["year"], result["day"]) != last:
+            last = (result["year"], result["day"])
+            print(f"\n=== {result['year']} Day {result['day']:02d} ===\n")
+        print(f"--- {result['input']} ---")
+        print_result(result)
+
+    problems = []
+    counts = {tuple(run["shard"])[1] for run in runs if run["shard"] is not None}
+    if len(counts) > 1:
+        problems.append(f"shards come from different splits: {sorted(counts)}")
+    elif counts:
+        (count,) = counts
+        seen = Counter(run["shard"][0] for run in runs if run["shard"] is not None)
+        missing = sorted(set(range(1, count + 1)) - set(seen))
+        duplicated = sorted(i for i, n in seen.items() if n > 1)
+        if missing:
+            problems.append(f"missing shard(s) {', '.join(f'{i}/{count}' for i in missing)}")
+        if duplicated:
+            problems.append(f"duplicated shard(s) {', '.join(f'{i}/{count}' for i in duplicated)}")
+    num_failed = sum(1 for r in results if r["error"] is not None or r.get("timeout"))
+    if num_failed:
+        problems.append(f"{num_failed} part(s) failed or timed out")
+
+    report_slowest(results, budget, report_top, report_json)
+    walls = [run["wall_seconds"] for run in runs]
+    cpu_seconds = sum(r["cpu_seconds"] for r in results if not r.get("cached"))
+    print(f"\n=== {len(results)} parts from {len(runs)} run(s): {max(walls):.3f} seconds wall-clock "
+          f"(slowest shard; {min(walls):.3f} fastest), {cpu_seconds:.3f} seconds summed CPU ===")
+    if output is not None:
+        output.write_text(json.dumps({"shards": [run["shard"] for run in runs], "wall_seconds": max(walls),
+                                      "results": results}, indent=2) + "\n")
+        print(f"Wrote {len(results)} results to {output}")
+    if problems:
+        print("\n".join(f"Error: {problem}" for problem in problems))
+        raise SystemExit(1)
+
+
+@cli.command(name="run-corpus")
+@click.argument("year", type=int)
+@click.argument("day", type=int)
+@click.argument("directory", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("-p1", "--part1-only", "part1_only", is_flag=True, default=False, help="Only run part 1.")
+@click.option("-p2", "--part2-only", "part2_only", is_flag=True, default=False, help="Only run part 2.")
+@click.option("-g", "--glob", "pattern", default="*", show_default=True, help="Which files in DIRECTORY to run.")
+@JOBS_OPTION
+@click.option("-o", "--output", "output", type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help="JSON Lines file to write, one record per input (default: corpus_YEAR_day_DD.jsonl).")
+@click.option("--top", "top", type=int, default=5, show_default=True, help="Number of slowest inputs to report.")
+def run_corpus_cmd(
+        year: int,
+        day: int,
+        directory: Path,
+        part1_only: bool,
+        part2_only: bool,
+        pattern: str,
+        jobs: int,
+        output: Path | None,
+        top: int,
+) -> None:
+    """
+    Runs a day on every input file in DIRECTORY through a process pool, writing each file's answers, timings and
+    peak memory as a JSON Lines record as soon as it finishes, then reports the slowest inputs.
+    """
+    _validate_flags(False, False, part1_only, part2_only)
+    jobs = _resolve_jobs(jobs)
+    paths = sorted(p for p in directory.glob(pattern) if p.is_file())
+    if not paths:
+        print(f"No files in {directory} match {pattern!r}.")
+        raise SystemExit(2)
+    get_solution(year, day)  # fail fast, and forked workers start with it imported
+    parts = [1] if part1_only else [2] if part2_only else [1, 2]
+    output = output or Path(f"corpus_{year}_day_{day:02d}.jsonl")
+    print(f"Running {year} day {day:02d} on {len(paths)} inputs from {directory} with {jobs} workers\n")
+
+    records = []
+    pending = iter(paths)
+    with no_nested_parallelism(jobs), ProcessPoolExecutor(max_workers=jobs) as executor, output.open("w") as f:
+        # keep a bounded number of files in flight, so huge corpora stream instead of queueing all at once
+        in_flight = {executor.submit(run_corpus_file, year, day, parts, path) for path in islice(pending, 2 * jobs)}
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                records.append(record)
+                print_corpus_record(record)
+            in_flight |= {executor.submit(run_corpus_file, year, day, parts, path)
+                          for path in islice(pending, len(done))}
+    print(f"\nWrote {len(records)} records to {output}")
+
+    num_failed = sum(1 for record in records if any(r["error"] is not None for r in record["parts"]))
+    seconds = [record["seconds"] for record in records]
+    print(f"\n=== Slowest {min(top, len(records))} of {len(records)} inputs "
+          f"(median {statistics.median(seconds):.3f}s, max {max(seconds):.3f}s, {num_failed} failed) ===\n")
+    for record in sorted(records, key=lambda r: -r["seconds"])[:top]:
+        print_corpus_record(record)
+    for record in records:
+        for r in record["parts"]:
+            if r["error"] is not None:
+                print(f"\n{record['file']} part {r['part']}:\n{r['error']}", end="", file=sys.stderr)
+    if num_failed:
+        raise SystemExit(1)
+
+
+@cli.command(name="watch")
+@click.argument("year", type=int)
+@click.argument("day", type=int)
+@apply_options(COMMON_OPTIONS)
+@click.option("-i", "--interval", "interval", type=float, default=0.25, show_default=True,
+              help="Seconds between checks for changed files.")
+def watch_cmd(
+        year: int, day: int, skip_example: bool, skip_puzzle: bool, part1_only: bool, part2_only: bool, interval: float,
+) -> None:
+    """Keeps one warm process that re-runs a day whenever its solution, inputs or aoc_utils change."""
+    _validate_flags(skip_example, skip_puzzle, part1_only, part2_only)
+    try:
+        watch_day(year, day, (skip_example, skip_puzzle, part1_only, part2_only), interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+SOCKET_OPTION = click.option(
+    "-s", "--socket", "socket_path", type=click.Path(dir_okay=False, path_type=Path), default=SOCKET_PATH,
+    show_default=True, help="Unix socket the daemon listens on.",
+)
+
+
+@cli.command(name="serve")
+@SOCKET_OPTION
+@click.option("-w", "--workers", "workers", type=int, default=0, help="Worker processes (0 uses every CPU).")
+@click.option("-q", "--queue-size", "queue_size", type=int, default=None,
+              help="Requests allowed in flight before new ones are rejected as busy (default: 4 per worker).")
+@click.option("--max-jobs-per-worker", "max_jobs_per_worker", type=int, default=100, show_default=True,
+              help="Replace each worker after it has served this many requests.")
+@click.option("--preload/--no-preload", "preload", default=True, show_default=True,
+              help="Import every solution in each worker at startup.")
+def serve_cmd(socket_path: Path, workers: int, queue_size: int | None, max_jobs_per_worker: int, preload: bool) -> None:
+    """Runs a solver daemon with a warm worker pool behind a JSON-over-Unix-socket API."""
+    workers = _resolve_jobs(workers)
+    if max_jobs_per_worker < 1 or (queue_size is not None and queue_size < 1):
+        print("Error: --queue-size and --max-jobs-per-worker must be positive.")
+        raise SystemExit(2)
+    try:
+        with no_nested_parallelism(workers):
+            asyncio.run(serve(socket_path, workers, queue_size or 4 * workers, max_jobs_per_worker, preload))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nStopped serving.")
+
+
+@cli.command(name="request")
+@click.argument("year", type=int)
+@click.argument("day", type=int)
+@click.argument("part", type=int)
+@click.argument("input_path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@SOCKET_OPTION
+def request_cmd(year: int, day: int, part: int, input_path: Path, socket_path: Path) -> None:
+    """Asks a running solver daemon to solve one part."""
+    request = {"year": year, "day": day, "part": part, "input_path": str(input_path.resolve())}
+    print(json.dumps(send_request(socket_path, request), indent=2))
+
+
+BENCHMARK_OPTIONS = [
+    click.argument("year", type=int, required=False),
+    click.argument("day", type=int, required=False),
+    *COMMON_OPTIONS,
+    click.option("-w", "--warmup", "warmup", type=int, default=1, help="Untimed calls before measuring."),
+    click.option("-r", "--repeat", "repeat", type=int, default=5, help="Timed calls per part."),
+    click.option("-o", "--output", "output", type=click.Path(dir_okay=False, path_type=Path), default=None,
+                 help="Append results to this file as JSON Lines."),
+    click.option("-b", "--baseline", "baseline", type=click.Path(dir_okay=False, path_type=Path),
+                 default=BASELINE_FILE, show_default=True, help="Baseline file to save to or compare against."),
+]
+
+
+def _run_benchmarks(
+        year: int | None,
+        day: int | None,
+        skip_example: bool,
+        skip_puzzle: bool,
+        part1_only: bool,
+        part2_only: bool,
+        warmup: int,
+        repeat: int,
+        output: Path | None,
+) -> list[dict]:
+    _validate_flags(skip_example, skip_puzzle, part1_only, part2_only)
+    if warmup < 0 or repeat < 1:
+        print("Error: --warmup must be non-negative and --repeat must be positive.")
+        raise SystemExit(2)
+    plan = plan_for(year, day, skip_example, skip_puzzle, part1_only, part2_only)
+    records = execute_plan(plan, 1, partial(benchmark_unit, warmup=warmup, repeat=repeat), print_benchmark)
+    if output is not None:
+        write_jsonl(output, records)
+    return records
+
+
+@cli.command(name="benchmark")
+@apply_options(BENCHMARK_OPTIONS)
+@click.option("--save-baseline", "save", is_flag=True, default=False,
+              help="Record the results in the baseline file.")
+def benchmark_cmd(save: bool, baseline: Path, **kwargs) -> None:
+    """Benchmarks a day, a year, or (with no arguments) every year with repeated, warmed-up timings."""
+    records = _run_benchmarks(**kwargs)
+    if save:
+        save_baseline(baseline, records)
+
+
+@cli.command(name="compare")
+@apply_options(BENCHMARK_OPTIONS)
+@click.option("-t", "--threshold", "threshold", type=float, default=0.10, show_default=True,
+              help="Allowed slowdown of the median, as a fraction of the baseline.")
+@click.option("--min-delta-ms", "min_delta_ms", type=float, default=1.0, show_default=True,
+              help="Ignore slowdowns smaller than this many milliseconds.")
+def compare_cmd(baseline: Path, threshold: float, min_delta_ms: float, **kwargs) -> None:
+    """Re-runs the benchmark and exits non-zero if any part regressed, failed or changed its answer."""
+    if not baseline.exists():
+        print(f"Error: baseline file {baseline} does not exist; run `benchmark --save-baseline` first.")
+        raise SystemExit(2)
+    records = _run_benchmarks(**kwargs)
+    num_regressions = compare_to_baseline(records, load_baseline(baseline), threshold, int(min_delta_ms * 1e6))
+    if num_regressions:
+        print(f"\n{num_regressions} part(s) regressed, failed or changed their answer.")
+        raise SystemExit(1)
+    print("\nNo regressions.")
+
+
+@cli.command(name="scale")
+@click.argument("year", type=int)
+@click.argument("day", type=int)
+@click.option("-p1", "--part1-only", "part1_only", is_flag=True, default=False, help="Only scale part 1.")
+@click.option("-p2", "--part2-only", "part2_only", is_flag=True, default=False, help="Only scale part 2.")
+@click.option("--start", "start", type=int, default=10, show_default=True, help="Smallest input size n.")
+@click.option("--factor", "factor", type=float, default=2.0, show_default=True, help="Growth factor between sizes.")
+@click.option("--steps", "steps", type=int, default=6, show_default=True, help="Number of sizes to try.")
+@click.option("-r", "--repeat", "repeat", type=int, default=3, show_default=True, help="Timed runs per size.")
+@click.option("--seed", "seed", type=int, default=0, show_default=True, help="Seed for the input generator.")
+@click.option("--max-seconds", "max_seconds", type=float, default=5.0, show_default=True,
+              help="Stop growing a part once a run takes longer than this.")
+def scale_cmd(
+        year: int,
+        day: int,
+        part1_only: bool,
+        part2_only: bool,
+        start: int,
+        factor: float,
+        steps: int,
+        repeat: int,
+        seed: int,
+        max_seconds: float,
+) -> None:
+    """Runs a day on generated inputs of growing size n and fits an empirical complexity exponent."""
+    _validate_flags(False, False, part1_only, part2_only)
+    if (year, day) not in GENERATORS:
+        registered = ", ".join(f"{y}/{d:02d}" for y, d in sorted(GENERATORS))
+        print(f"Error: no input generator for {year} day {day:02d} (have: {registered}).")
+        raise SystemExit(2)
+    if start < 1 or factor <= 1 or steps < 2 or repeat < 1:
+        print("Error: --start and --repeat must be positive, --factor above 1 and --steps at least 2.")
+        raise SystemExit(2)
+    sizes = sorted({round(start * factor ** k) for k in range(steps)})
+    parts = [1] if part1_only else [2] if part2_only else [1, 2]
+    print(f"Scaling {year} day {day:02d} over n = {', '.join(map(str, sizes))}")
+    points = scale_day(year, day, parts, sizes, repeat, seed, max_seconds)
+    print()
+    for part in parts:
+        if len(points[part]) < 2:
+            print(f"Part {part}: not enough sizes completed to fit an exponent.")
+            continue
+        k, r2 = fit_exponent(points[part])
+        note = "  <- superlinear in n (see the generator for what n measures)" if k >= 1.5 else ""
+        print(f"Part {part}: time ~ n^{k:.2f} (R^2 {r2:.3f}, {len(points[part])} sizes){note}")
+
+
+@cli.command(name="compare-variants")
+@click.argument("year", type=int)
+@click.argument("day", type=int)
+@apply_options(COMMON_OPTIONS)
+@click.option("-v", "--variant", "variants", multiple=True,
+              help="Variant to include (the NAME in solution_NAME.py); repeatable. Defaults to all of them.")
+@click.option("-w", "--warmup", "warmup", type=int, default=1, show_default=True,
+              help="Untimed calls of each variant before measuring (at least 1, which checks the answers).")
+@click.option("-r", "--repeat", "repeat", type=int, default=10, show_default=True,
+              help="Interleaved timed rounds per part.")
+def compare_variants_cmd(
+        year: int,
+        day: int,
+        skip_example: bool,
+        skip_puzzle: bool,
+        part1_only: bool,
+        part2_only: bool,
+        variants: tuple[str, ...],
+        warmup: int,
+        repeat: int,
+) -> None:
+    """
+    Benchmarks solution.py against its solution_*.py variants on the same inputs, checks that their answers
+    agree and reports each variant's speedup over solution.py. Exits non-zero if any answers differ or fail.
+    """
+    _validate_flags(skip_example, skip_puzzle, part1_only, part2_only)
+    if warmup < 1 or repeat < 2:
+        print("Error: --warmup must be at least 1 and --repeat at least 2.")
+        raise SystemExit(2)
+    available = find_solution_variants(year, day)
+    unknown = sorted(set(variants) - set(available))
+    if unknown or not available:
+        print(f"Error: {year} day {day:02d} has variants {available or 'none'}; unknown: {', '.join(unknown)}"
+              if unknown else f"Error: {year} day {day:02d} has no solution_*.py variants to compare.")
+        raise SystemExit(2)
+
+    # each candidate is solve_part_N, fed its own module's two-phase parse when it has one, so parsing is timed too
+    candidates = {}
+    for variant in [None, *(variants or available)]:
+        solve_fns = load_solution_module(year, day, variant)
+        parse = module_two_phase_parse(sys.modules[solution_module_name(year, day, variant)])
+        name = "solution" if variant is None else f"solution_{variant}"
+        candidates[name] = [fn if parse is None else partial(lambda p, f, arg: f(p(arg)), parse, fn)
+                            for fn in solve_fns]
+
+    input_dir = day_dir(year, day) / "input"
+    filenames = [] if skip_example else sorted(p.name for p in input_dir.glob("*example*.txt"))
+    filenames += [] if skip_puzzle else ["puzzle.txt"]
+    parts = [1] if part1_only else [2] if part2_only else [1, 2]
+    num_problems = 0
+    for filename in filenames:
+        puzzle_input = read_puzzle_input(input_dir, filename)
+        if puzzle_input is None:
+            continue
+        for part in parts:
+            print(f"\n--- {filename}, part {part} ---")
+            fns = {name: solve_fns[part - 1] for name, solve_fns in candidates.items()}
+            runs = interleaved_timings(fns, puzzle_input, warmup, repeat)
+            base = runs["solution"]
+            width = max(map(len, runs))
+            for name, run in runs.items():
+                if run["error"] is not None:
+                    print(f"  {name:<{width}}  ERROR")
+                    print(run["error"], end="", file=sys.stderr)
+                    num_problems += 1
+                    continue
+                line = f"  {name:<{width}}  median {format_ns(statistics.median(run['timings'])):>11}  {run['answer']}"
+                if name != "solution" and base["error"] is None:
+                    speedup, low, high = speedup_interval(base["timings"], run["timings"])
+                    line += f"  {speedup:.2f}x [{low:.2f}x, {high:.2f}x]"
+                    if run["answer"] != base["answer"]:
+                        line += "  ANSWER MISMATCH"
+                        num_problems += 1
+                print(line)
+    if num_problems:
+        print(f"\n{num_problems} variant result(s) failed or disagreed with solution.py.")
+        raise SystemExit(1)
+    print(f"\nSpeedups are relative to solution.py, with 95% confidence intervals over {repeat} interleaved rounds.")
 
 
 if __name__ == "__main__":
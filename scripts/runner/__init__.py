@@ -0,0 +1,13 @@
+"""
+The machinery behind `run.py`, which only defines the command-line interface: loading solutions (`solutions`),
+planning and running them (`plan`, `execution`), measuring them (`profiling`, `benchmark`), and the answer cache,
+sharding, slowest-parts report, watch mode, solver daemon and corpus runs built on top.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+SRC_DIR = ROOT_DIR / "src"
+UTILS_DIR = SRC_DIR / "aoc_utils"
+sys.path.insert(0, str(SRC_DIR))  # solutions and the runner import aoc_utils from src/
@@ -0,0 +1,281 @@
+"""
+Repeated, warmed-up timings of solutions: benchmarks and their baseline, scaling runs on generated inputs and
+interleaved comparisons between solution variants.
+"""
+
+import json
+import math
+import random
+import statistics
+import sys
+import time
+import traceback
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+from input_generators import GENERATORS
+
+from aoc_utils import PuzzleInput, memo
+
+from . import ROOT_DIR
+from .solutions import (
+    day_dir,
+    get_parse_fn,
+    get_solution,
+    get_two_phase_parse,
+    hash_input,
+    parse_once,
+    read_puzzle_input,
+)
+
+BASELINE_FILE = ROOT_DIR / "scripts" / "baseline.json"
+
+
+def _time_ns(fn: Callable, make_arg: Callable, warmup: int, repeat: int) -> tuple[object, list[int]]:
+    """
+    Calls fn(make_arg()) `warmup` times untimed, then `repeat` times timed; make_arg() itself is never timed.
+    Memoized aoc_utils functions start cold on every call. Returns the last result and the timings.
+    """
+    result = None
+    for _ in range(warmup):
+        memo.clear_memos()
+        result = fn(make_arg())
+    timings = []
+    for _ in range(repeat):
+        memo.clear_memos()
+        arg = make_arg()
+        t0 = time.perf_counter_ns()
+        result = fn(arg)
+        timings.append(time.perf_counter_ns() - t0)
+    return result, timings
+
+
+def _summarize_ns(timings: list[int]) -> dict:
+    ordered = sorted(timings)
+    return {
+        "n": len(ordered),
+        "min_ns": ordered[0],
+        "median_ns": int(statistics.median(ordered)),
+        "p95_ns": int(statistics.quantiles(ordered, n=20, method="inclusive")[18]) if len(ordered) > 1 else ordered[0],
+        "stdev_ns": int(statistics.stdev(ordered)) if len(ordered) > 1 else 0,
+    }
+
+
+def benchmark_unit(unit: tuple[int, int, str, int], warmup: int = 1, repeat: int = 5) -> dict:
+    """
+    Times one unit repeatedly, timing the day's parse or parse_input separately when it exposes one.
+    For two-phase days the solve timings exclude parsing.
+    """
+    year, day, filename, part = unit
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "year": year, "day": day, "input": filename, "part": part,
+        "input_sha256": None, "warmup": warmup, "answer": None, "parse": None, "solve": None, "error": None,
+    }
+    puzzle_input = read_puzzle_input(day_dir(year, day) / "input", filename)
+    if puzzle_input is None:
+        return {**record, "error": f"Failed to read {filename}\n"}
+    record["input_sha256"] = hash_input(day_dir(year, day) / "input" / filename)
+    try:
+        parse_fn = get_parse_fn(year, day, part)
+        if parse_fn is not None:
+            parse_timings = _time_ns(parse_fn, partial(lambda arg: arg, puzzle_input), warmup, repeat)[1]
+            record["parse"] = _summarize_ns(parse_timings)
+        if get_two_phase_parse(year, day) is not None:
+            make_arg = parse_once(year, day, record["input_sha256"], puzzle_input)[0]
+        else:
+            make_arg = partial(lambda arg: arg, puzzle_input)
+        answer, timings = _time_ns(get_solution(year, day)[part - 1], make_arg, warmup, repeat)
+        record["answer"] = str(answer)
+        record["solve"] = _summarize_ns(timings)
+    except Exception:
+        record["error"] = traceback.format_exc()
+    return record
+
+
+def fit_exponent(points: list[tuple[int, float]]) -> tuple[float, float]:
+    """
+    Least-squares fit of log(seconds) against log(n). Returns the slope k, i.e. the runtime grows like n^k,
+    and the R^2 of the fit.
+    """
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(seconds) for _, seconds in points]
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    k = sxy / sxx
+    return k, (sxy * sxy / (sxx * syy) if syy else 1.0)
+
+
+def scale_day(
+        year: int, day: int, parts: list[int], sizes: list[int], repeat: int, seed: int, max_seconds: float,
+) -> dict[int, list[tuple[int, float]]]:
+    """
+    Times each part on generated inputs of every size in `sizes` (median of `repeat` runs, parsing included),
+    printing a row per size. A part stops growing once its median exceeds `max_seconds` or it fails.
+    """
+    solve_fns = get_solution(year, day)
+    parse = get_two_phase_parse(year, day)
+    points = {part: [] for part in parts}
+    active = list(parts)
+    for n in sizes:
+        if not active:
+            break
+        data = ("\n".join(GENERATORS[(year, day)](n, random.Random(seed))) + "\n").encode()
+        puzzle_input = PuzzleInput.from_bytes(data)
+        row = [f"n={n:<8}"]
+        for part in list(active):
+            solve = solve_fns[part - 1]
+            if parse is not None:
+                solve = partial(lambda fn, arg: fn(parse(arg)), solve)
+            try:
+                seconds = statistics.median(_time_ns(solve, partial(lambda arg: arg, puzzle_input), 0, repeat)[1]) / 1e9
+            except Exception:
+                row.append(f"part {part}: ERROR")
+                print(traceback.format_exc(), end="", file=sys.stderr)
+                active.remove(part)
+                continue
+            points[part].append((n, seconds))
+            row.append(f"part {part}: {format_ns(seconds * 1e9):>11}")
+            if seconds > max_seconds:
+                active.remove(part)
+        print("  ".join(row), flush=True)
+    return points
+
+
+def format_ns(ns: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.3f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def _format_stats(stats: dict) -> str:
+    return (f"min {format_ns(stats['min_ns'])}, median {format_ns(stats['median_ns'])}, "
+            f"p95 {format_ns(stats['p95_ns'])}, stdev {format_ns(stats['stdev_ns'])} (n={stats['n']})")
+
+
+def print_benchmark(record: dict) -> None:
+    num = record["part"]
+    if record["error"] is not None:
+        print(f"Part {num}: ERROR")
+        print(record["error"], end="", file=sys.stderr)
+        return
+    print(f"Part {num}: {record['answer']}")
+    if record["parse"] is not None:
+        print(f"  parse: {_format_stats(record['parse'])}")
+    print(f"  solve: {_format_stats(record['solve'])}")
+
+
+def write_jsonl(path: Path, records: list[dict]) -> None:
+    with path.open("a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    print(f"Wrote {len(records)} records to {path}")
+
+
+def _baseline_key(record: dict) -> str:
+    return f"{record['year']}/{record['day']:02d}/{record['part']}/{record['input_sha256']}"
+
+
+def load_baseline(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(path: Path, records: list[dict]) -> None:
+    """Merges successful benchmark records into the baseline file, keyed by year/day/part/input hash."""
+    baseline = load_baseline(path)
+    saved = 0
+    for record in records:
+        if record["error"] is None:
+            baseline[_baseline_key(record)] = {"input": record["input"], "answer": record["answer"],
+                                               "timestamp": record["timestamp"], **record["solve"]}
+            saved += 1
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+    print(f"Saved {saved} baseline entries to {path}")
+
+
+def compare_to_baseline(records: list[dict], baseline: dict[str, dict], threshold: float, min_delta_ns: int) -> int:
+    """
+    Prints each part's median against its baseline and returns the number of regressions: parts that fail, whose
+    answer differs from the baseline's, or whose median exceeds the baseline median by more than `threshold`
+    (a fraction) and by at least `min_delta_ns`.
+    """
+    print("\n=== Comparison against baseline ===\n")
+    num_regressions = 0
+    for record in records:
+        label = f"{record['year']} day {record['day']:02d} part {record['part']} ({record['input']})"
+        if record["error"] is not None:
+            print(f"ERROR       {label}")
+            num_regressions += 1
+            continue
+        entry = baseline.get(_baseline_key(record))
+        if entry is None:
+            print(f"NO BASELINE {label}")
+            continue
+        old, new = entry["median_ns"], record["solve"]["median_ns"]
+        change = (new - old) / old if old > 0 else 0.0
+        if entry["answer"] != record["answer"]:
+            status = "CHANGED"
+            num_regressions += 1
+        elif change > threshold and new - old >= min_delta_ns:
+            status = "REGRESSION"
+            num_regressions += 1
+        elif change < -threshold and old - new >= min_delta_ns:
+            status = "FASTER"
+        else:
+            status = "OK"
+        print(f"{status:<11} {label}: {format_ns(old)} -> {format_ns(new)} ({change:+.1%})")
+        if entry["answer"] != record["answer"]:
+            print(f"            answer changed: {entry['answer']} -> {record['answer']}")
+    return num_regressions
+
+
+def interleaved_timings(fns: dict[str, Callable], arg: object, warmup: int, repeat: int) -> dict[str, dict]:
+    """
+    Times every function on the same argument, one call of each per round, rotating which goes first, so drift
+    (thermal throttling, background load) hits all of them alike and round i of each can be compared pairwise.
+    Returns each one's answer (from its first call) and timings, or its error: a function that raises, whether
+    warming up or in a timed round, drops out of the remaining rounds.
+    """
+    runs = {name: {"answer": None, "timings": [], "error": None} for name in fns}
+    for name, fn in fns.items():
+        try:
+            memo.clear_memos()
+            runs[name]["answer"] = str(fn(arg))
+            for _ in range(warmup - 1):
+                memo.clear_memos()
+                fn(arg)
+        except Exception:
+            runs[name]["error"] = traceback.format_exc()
+    names = [name for name in fns if runs[name]["error"] is None]
+    for rnd in range(repeat):
+        if not names:
+            break
+        for name in names[rnd % len(names):] + names[:rnd % len(names)]:
+            try:
+                memo.clear_memos()
+                t0 = time.perf_counter_ns()
+                fns[name](arg)
+                runs[name]["timings"].append(time.perf_counter_ns() - t0)
+            except Exception:
+                runs[name]["error"] = traceback.format_exc()
+                names.remove(name)
+    return runs
+
+
+def speedup_interval(base: list[int], other: list[int], resamples: int = 2000) -> tuple[float, float, float]:
+    """
+    Speedup of `other` over `base` (>1 is faster) as the geometric mean of the per-round ratios, with a 95%
+    bootstrap confidence interval. Seeded, so the same timings always give the same interval.
+    """
+    log_ratios = [math.log(b / o) for b, o in zip(base, other)]
+    rng = random.Random(0)
+    means = sorted(statistics.fmean(rng.choices(log_ratios, k=len(log_ratios))) for _ in range(resamples))
+    low, high = means[int(0.025 * resamples)], means[int(0.975 * resamples) - 1]
+    return math.exp(statistics.fmean(log_ratios)), math.exp(low), math.exp(high)
@@ -0,0 +1,74 @@
+"""
+The on-disk answer cache: results keyed by a hash of the solution, the aoc_utils sources it imports and the input,
+evicted least recently used first once it outgrows `CACHE_MAX_BYTES`.
+"""
+
+import ast
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from . import ROOT_DIR, UTILS_DIR
+from .solutions import day_dir, hash_input
+
+CACHE_DIR = ROOT_DIR / ".aoc_cache"
+CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def solution_fingerprint(year: int, day: int) -> str:
+    """
+    Hashes a day's solution.py together with the aoc_utils sources if it imports aoc_utils
+    (importing any name from the package executes every module in it).
+    """
+    solution_path = day_dir(year, day) / "solution.py"
+    source = solution_path.read_bytes()
+    h = hashlib.sha256(source)
+    imports_utils = any(
+        (isinstance(node, ast.ImportFrom) and (node.module or "").startswith("aoc_utils")) or
+        (isinstance(node, ast.Import) and any(alias.name.startswith("aoc_utils") for alias in node.names))
+        for node in ast.walk(ast.parse(source))
+    )
+    if imports_utils:
+        for path in sorted(UTILS_DIR.glob("*.py")):
+            h.update(path.name.encode())
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def cache_path(year: int, day: int, filename: str, part: int) -> Path:
+    input_hash = hash_input(day_dir(year, day) / "input" / filename)
+    key = hashlib.sha256(f"{solution_fingerprint(year, day)}/{input_hash}/{part}".encode()).hexdigest()
+    return CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def cache_get(path: Path) -> dict | None:
+    try:
+        cached = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    os.utime(path)  # mark as recently used for eviction
+    return cached
+
+
+def cache_put(path: Path, result: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    keys = ("part", "answer", "seconds", "cpu_seconds", "error", "parse_seconds", "parse_reused")
+    tmp_path.write_text(json.dumps({k: result[k] for k in keys if k in result}))
+    os.replace(tmp_path, path)  # atomic, so concurrent workers never see a partial entry
+
+
+def evict_cache(max_bytes: int = CACHE_MAX_BYTES) -> None:
+    """Deletes the least recently used cache entries until the cache fits in `max_bytes`."""
+    if not CACHE_DIR.exists():
+        return
+    entries = sorted((p.stat().st_mtime, p.stat().st_size, p) for p in CACHE_DIR.glob("*/*.json"))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
@@ -0,0 +1,36 @@
+"""
+`run.py run-corpus`: one day on a directory of inputs, one pool task per input file.
+"""
+
+import hashlib
+from pathlib import Path
+
+from aoc_utils import PuzzleInput
+
+from .execution import solve_input
+from .profiling import format_bytes, peak_rss_bytes, reset_peak_rss
+
+
+def run_corpus_file(year: int, day: int, parts: list[int], path: Path) -> dict:
+    """
+    Runs the selected parts of a day on one corpus file, in a pool worker. Peak RSS covers just this file
+    where the high-water mark can be reset, and the worker's lifetime otherwise.
+    """
+    data = path.read_bytes()
+    record = {
+        "year": year, "day": day, "file": str(path), "input_sha256": hashlib.sha256(data).hexdigest()[:16],
+        "bytes": len(data), "peak_rss_bytes": None, "peak_rss_per_input": reset_peak_rss(), "parts": [],
+    }
+    puzzle_input = PuzzleInput.from_bytes(data)
+    for part in parts:
+        record["parts"].append(solve_input(year, day, part, puzzle_input, record["input_sha256"]))
+    record["peak_rss_bytes"] = peak_rss_bytes()
+    record["seconds"] = sum(r["seconds"] for r in record["parts"])
+    return record
+
+
+def print_corpus_record(record: dict) -> None:
+    answers = ", ".join(f"part {r['part']}: {'ERROR' if r['error'] is not None else r['answer']}"
+                        for r in record["parts"])
+    print(f"{record['seconds']:9.3f}s  {format_bytes(record['peak_rss_bytes']):>10}  {record['file']}  ({answers})",
+          flush=True)
@@ -0,0 +1,157 @@
+"""
+`run.py serve`: a solver daemon answering newline-delimited JSON requests on a Unix socket from a warm worker pool.
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from aoc_utils import PuzzleInput
+
+from .execution import solve_input
+from .solutions import get_solution, hash_input, list_days, list_years
+
+SOCKET_PATH = Path(tempfile.gettempdir()) / "aoc-solver.sock"
+MAX_REQUEST_BYTES = 64 * 1024 * 1024  # inline inputs make requests far longer than asyncio's 64 KiB default line
+
+
+def _warm_worker(preload: bool) -> None:
+    """Daemon worker initializer: imports aoc_utils and (with `preload`) every solution before serving requests."""
+    import aoc_utils  # noqa: F401
+    if preload:
+        for year in list_years():
+            for day in list_days(year):
+                try:
+                    get_solution(year, day)
+                except Exception:
+                    pass  # reported when the day is actually requested
+
+
+def _serve_request(request: dict) -> dict:
+    """
+    Solves one daemon request: {"year", "day", "part"} plus either "input_path" (a file) or "input" (its text).
+    Runs in a daemon worker process.
+    """
+    try:
+        year, day, part = int(request["year"]), int(request["day"]), int(request["part"])
+        if part not in (1, 2):
+            raise ValueError(f"part must be 1 or 2, not {part}")
+        if "input" in request:
+            data = request["input"].encode()
+            puzzle_input, input_hash = PuzzleInput.from_bytes(data), hashlib.sha256(data).hexdigest()[:16]
+        else:
+            input_path = Path(request["input_path"])
+            puzzle_input, input_hash = PuzzleInput.from_file(input_path), hash_input(input_path)
+        result = solve_input(year, day, part, puzzle_input, input_hash)
+    except Exception as exc:
+        return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+    return {"ok": result["error"] is None, **result, "pid": os.getpid()}
+
+
+async def _read_request(reader: asyncio.StreamReader) -> bytes | None:
+    """
+    The next newline-terminated request, b"" at the end of the stream, or None for a request longer than the
+    reader's limit, whose remaining bytes are skipped so the requests after it can still be read.
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as exc:
+        return exc.partial  # the last request may lack its newline
+    except asyncio.LimitOverrunError as exc:
+        overrun = exc
+    while True:
+        await reader.readexactly(overrun.consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return None
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as exc:
+            overrun = exc
+
+
+async def serve(socket_path: Path, workers: int, queue_size: int, max_jobs_per_worker: int, preload: bool) -> None:
+    """
+    Serves newline-delimited JSON requests on a Unix socket. Each connection may pipeline several requests;
+    responses echo the request's "id" and are written as soon as they're ready. When `queue_size` requests are
+    already in flight, new ones are rejected immediately with {"ok": false, "error": "busy"} so clients can back off.
+    Requests may be up to `MAX_REQUEST_BYTES` long; longer ones get a "bad request" error.
+    Workers are replaced after `max_jobs_per_worker` requests to bound memory growth.
+    """
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_warm_worker,
+        initargs=(preload,),
+        max_tasks_per_child=max_jobs_per_worker,
+    )
+    loop = asyncio.get_running_loop()
+    stats = {"in_flight": 0, "served": 0, "rejected": 0}
+
+    async def respond(request: dict, writer: asyncio.StreamWriter) -> None:
+        if request.get("op") == "stats":
+            response = {"ok": True, **stats, "queue_size": queue_size, "workers": workers}
+        elif stats["in_flight"] >= queue_size:
+            stats["rejected"] += 1
+            response = {"ok": False, "error": "busy"}
+        else:
+            stats["in_flight"] += 1
+            try:
+                response = await loop.run_in_executor(pool, _serve_request, request)
+            except Exception as exc:  # e.g. a worker died mid-request
+                response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+            finally:
+                stats["in_flight"] -= 1
+            stats["served"] += 1
+        if "id" in request:
+            response = {"id": request["id"], **response}
+        writer.write((json.dumps(response) + "\n").encode())
+        await writer.drain()
+
+    async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        tasks = set()
+        while (line := await _read_request(reader)) != b"":
+            try:
+                if line is None:
+                    raise ValueError(f"longer than {MAX_REQUEST_BYTES:,} bytes")
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as exc:
+                writer.write((json.dumps({"ok": False, "error": f"bad request: {exc}"}) + "\n").encode())
+                continue
+            task = asyncio.create_task(respond(request, writer))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+        writer.close()
+
+    # start every worker now, so the first requests don't pay for interpreter startup and imports
+    await asyncio.gather(*(loop.run_in_executor(pool, os.getpid) for _ in range(workers)))
+    socket_path.unlink(missing_ok=True)
+    server = await asyncio.start_unix_server(handle_connection, path=str(socket_path), limit=MAX_REQUEST_BYTES)
+    loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)  # clean up the socket on kill too
+    print(f"Serving on {socket_path} with {workers} workers (queue size {queue_size}, "
+          f"recycled every {max_jobs_per_worker} jobs)", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        socket_path.unlink(missing_ok=True)
+        pool.shutdown(cancel_futures=True)
+
+
+def send_request(socket_path: Path, request: dict) -> dict:
+    """Sends one request to a running daemon and waits for its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall((json.dumps(request) + "\n").encode())
+        with sock.makefile("r") as f:
+            return json.loads(f.readline())
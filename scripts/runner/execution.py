@@ -0,0 +1,410 @@
+"""
+Running plans: each unit in-process, in a process pool, or in killable worker subprocesses when there's a timeout.
+"""
+
+import multiprocessing
+import os
+import queue
+import sys
+import time
+import traceback
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, nullcontext
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+from aoc_utils import instrumentation, memo
+
+from . import SRC_DIR
+from .benchmark import BASELINE_FILE, load_baseline
+from .cache import cache_get, cache_path, cache_put, evict_cache
+from .plan import Plan, plan_all, plan_day, plan_year
+from .profiling import PROFILE_DIR, print_memory, print_profile, run_test_case, summarize_profile
+from .report import report_slowest
+from .shard import plan_shard, write_results
+from .solutions import (
+    day_dir,
+    get_solution,
+    get_two_phase_parse,
+    hash_input,
+    import_seconds,
+    list_years,
+    parse_once,
+    read_puzzle_input,
+)
+
+IMPORT_TIMEOUT = 60.0  # seconds a --timeout worker may take to import a solution, on top of the parts' budget
+
+
+def print_result(result: dict) -> None:
+    num = result["part"]
+    if result.get("timeout"):
+        print(f"Part {num}: TIMEOUT")
+        print(f"(killed after {result['seconds']:.3} seconds)")
+    elif result["error"] is not None:
+        print(f"Part {num}: ERROR")
+        print(result["error"], end="", file=sys.stderr)
+    else:
+        print(f"Part {num}: {result['answer']}")
+        notes = [f"{result['seconds']:.3} seconds"]
+        if "parse_seconds" in result:
+            notes.append("parse reused" if result["parse_reused"] else f"parse {result['parse_seconds']:.3} seconds")
+        if result.get("cached"):
+            notes.append("cached")
+        print(f"({', '.join(notes)})")
+    if "memory" in result:
+        print_memory(result["memory"])
+    if "profile" in result:
+        print_profile(result["profile"])
+    for name, info in result.get("memo", {}).items():
+        print(f"  memo {name}: {info['hits']:,} hits, {info['misses']:,} misses, {info['size']:,} entries, "
+              f"{info['evictions']:,} evicted")
+    if "counters" in result:
+        counts = ", ".join(f"{name} {count:,}" for name, count in sorted(result["counters"].items()))
+        print(f"  counters: {counts or 'no instrumented aoc_utils calls'}")
+
+
+def solve_input(
+        year: int,
+        day: int,
+        part: int,
+        puzzle_input: Sequence[str],
+        input_hash: str,
+        memory: bool = False,
+        profile_mode: str | None = None,
+) -> dict:
+    """
+    Runs one part of a day on an already-loaded input, parsing it first for two-phase days.
+    `input_hash` identifies the input so both parts can share one parse.
+    Memoized aoc_utils functions are cleared before and after, and their statistics are reported under "memo".
+    """
+    solve_fn = get_solution(year, day)[part - 1]
+    parse_info = {}
+    with memo.memo_scope() as memo_stats:
+        if get_two_phase_parse(year, day) is not None:
+            try:
+                make_arg, parse_seconds, reused = parse_once(year, day, input_hash, puzzle_input)
+                puzzle_input = make_arg()
+            except Exception:
+                return {"part": part, "answer": None, "seconds": 0.0, "cpu_seconds": 0.0,
+                        "error": traceback.format_exc()}
+            parse_info = {"parse_seconds": parse_seconds, "parse_reused": reused}
+        result = {**run_test_case(part, puzzle_input, solve_fn, memory, profile_mode), **parse_info}
+    if memo_stats:
+        result["memo"] = memo_stats
+    return result
+
+
+def run_unit(
+        unit: tuple[int, int, str, int],
+        memory: bool = False,
+        profile: bool = False,
+        sample: bool = False,
+        profile_top: int = 10,
+        profile_dir: Path = PROFILE_DIR,
+        cache: bool = True,
+        counters: bool = False,
+) -> dict:
+    """
+    Runs one (year, day, input file, part) unit of work. Safe to call from a worker process.
+    With `cache`, answers are looked up by a hash of the solution, the aoc_utils sources and the input,
+    and reused with their original timing. Memory, profile and counter runs always execute.
+    """
+    year, day, filename, part = unit
+    record = {"year": year, "day": day, "input": filename}
+    puzzle_input = read_puzzle_input(day_dir(year, day) / "input", filename)
+    if puzzle_input is None:
+        return {**record, "part": part, "answer": None, "seconds": 0.0, "cpu_seconds": 0.0,
+                "error": f"Failed to read {filename}\n"}
+
+    cache_file = cache_path(year, day, filename, part) if cache and not (memory or profile or counters) else None
+    if cache_file is not None and (cached := cache_get(cache_file)) is not None:
+        return {**record, **cached, "cached": True}
+
+    profile_mode = ("sample" if sample else "trace") if profile else None
+    input_hash = hash_input(day_dir(year, day) / "input" / filename)
+    with instrumentation.counting() if counters else nullcontext() as counts:
+        result = {**record, **solve_input(year, day, part, puzzle_input, input_hash, memory, profile_mode)}
+    if counters:
+        result["counters"] = dict(counts)
+    if profile:
+        path = profile_dir / f"{year}_day_{day:02d}_{Path(filename).stem}_part_{part}.pstats"
+        result["profile"] = summarize_profile(result.pop("profile_stats"), path, sample, profile_top)
+    if cache_file is not None and result["error"] is None:
+        cache_put(cache_file, result)
+    return result
+
+
+def _worker_loop(conn) -> None:
+    """Runs (run_fn, unit) requests sent by the parent process until it closes the pipe."""
+    # daemonic processes can't start a pool of their own, so map_reduce stays serial in here
+    os.environ["AOC_MAX_WORKERS"] = "1"
+    conn.send(None)  # ready: interpreter startup shouldn't count against the first unit's time budget
+    while True:
+        try:
+            run_fn, unit = conn.recv()
+        except EOFError:
+            return
+        conn.send(run_fn(unit))
+
+
+def _load_solution(unit: tuple[int, int, str, int]) -> None:
+    """Imports a unit's solution in a worker process. Import errors are left for the unit itself to report."""
+    year, day = unit[:2]
+    try:
+        get_solution(year, day)
+    except Exception:
+        pass
+
+
+class _IsolatedWorker:
+    """
+    A reusable subprocess for running units. If a unit overruns its time budget the process is killed,
+    and a fresh one is started for the next unit.
+    """
+
+    def __init__(self):
+        self.context = multiprocessing.get_context("spawn")
+        self.process = None
+        self.conn = None
+        self.loaded_days = set()
+
+    def _start(self) -> None:
+        self.conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn.recv()
+        self.loaded_days = set()
+
+    def _call(self, fn: Callable, unit: tuple[int, int, str, int], record: dict, timeout: float) -> tuple[bool, object]:
+        """
+        Runs fn(unit) in the worker. Returns (True, its result), or, killing the worker if fn overruns or the worker
+        dies, (False, `record` filled in as a TIMEOUT or an error).
+        """
+        t0 = time.perf_counter()
+        self.conn.send((fn, unit))
+        if self.conn.poll(timeout):
+            try:
+                return True, self.conn.recv()
+            except EOFError:
+                self.process.join(timeout=1)
+                exitcode = self.process.exitcode
+                self.kill()
+                return False, {**record, "seconds": time.perf_counter() - t0,
+                               "error": f"Worker process exited unexpectedly (exit code {exitcode})\n"}
+        self.kill()
+        return False, {**record, "seconds": time.perf_counter() - t0, "error": None, "timeout": True}
+
+    def run(self, run_fn: Callable, unit: tuple[int, int, str, int], timeout: float) -> dict:
+        if self.process is None or not self.process.is_alive():
+            self._start()
+        year, day, filename, part = unit
+        record = {"year": year, "day": day, "input": filename, "part": part, "answer": None, "cpu_seconds": 0.0}
+
+        if (year, day) not in self.loaded_days:
+            # like interpreter startup, importing the solution and its dependencies isn't part of the time budget,
+            # though it gets a budget of its own, so that an import that hangs can't stall the run
+            loaded, failure = self._call(_load_solution, unit, record, max(timeout, IMPORT_TIMEOUT))
+            if not loaded:
+                return failure
+            self.loaded_days.add((year, day))
+        return self._call(run_fn, unit, record, timeout)[1]
+
+    def kill(self) -> None:
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+            self.conn.close()
+            self.process = None
+
+    def close(self) -> None:
+        if self.process is not None:
+            self.conn.close()  # the worker exits when it sees EOF
+            self.process.join(timeout=1)
+            self.kill()
+
+
+@contextmanager
+def _isolated(run_fn: Callable, jobs: int, timeout: float) -> Iterator[Callable]:
+    """
+    Yields a drop-in replacement for run_fn that runs each unit in one of `jobs` reusable worker subprocesses,
+    returning a TIMEOUT result for any unit that takes longer than `timeout` seconds. Safe to call from threads.
+    """
+    workers = [_IsolatedWorker() for _ in range(jobs)]
+    idle = queue.SimpleQueue()
+    for worker in workers:
+        idle.put(worker)
+
+    def run_isolated(unit: tuple[int, int, str, int]) -> dict:
+        worker = idle.get()
+        try:
+            return worker.run(run_fn, unit, timeout)
+        finally:
+            idle.put(worker)
+
+    try:
+        yield run_isolated
+    finally:
+        for worker in workers:
+            worker.close()
+
+
+@contextmanager
+def no_nested_parallelism(workers: int) -> Iterator[None]:
+    """
+    While several parts already run side by side, stops aoc_utils.parallel inside them from fanning out to every
+    CPU again (child processes inherit the environment variable).
+    """
+    if workers <= 1 or "AOC_MAX_WORKERS" in os.environ:
+        yield
+        return
+    os.environ["AOC_MAX_WORKERS"] = "1"
+    try:
+        yield
+    finally:
+        os.environ.pop("AOC_MAX_WORKERS", None)
+
+
+def execute_plan(
+        plan: Plan,
+        jobs: int = 1,
+        run_fn: Callable[[tuple[int, int, str, int]], dict] = run_unit,
+        print_fn: Callable[[dict], None] = print_result,
+        timeout: float | None = None,
+) -> list[dict]:
+    """
+    Runs every unit in the plan, printing messages and results in plan order.
+    With jobs > 1, units are sent to a process pool; results are still printed in order as they become available.
+    With a timeout, every unit runs in a reusable worker subprocess that is killed if the unit overruns.
+    """
+    results = []
+    with ExitStack() as stack:
+        stack.enter_context(no_nested_parallelism(jobs))
+        if timeout is not None:
+            run_fn = stack.enter_context(_isolated(run_fn, jobs, timeout))
+
+        if jobs <= 1:
+            for item in plan:
+                if isinstance(item, str):
+                    print(item, flush=True)
+                else:
+                    results.append(run_fn(item))
+                    print_fn(results[-1])
+            return results
+
+        # planning loads every solution module up front, so forked workers start with them already imported
+        items = list(plan)
+        units = [item for item in items if not isinstance(item, str)]
+        # isolated workers are already separate processes, so threads are enough to drive them concurrently
+        executor_cls = ThreadPoolExecutor if timeout is not None else ProcessPoolExecutor
+        executor = stack.enter_context(executor_cls(max_workers=jobs))
+        unit_results = executor.map(run_fn, units)
+        for item in items:
+            if isinstance(item, str):
+                print(item, flush=True)
+            else:
+                results.append(next(unit_results))
+                print_fn(results[-1])
+    return results
+
+
+def _print_timing_summary(results: list[dict], wall_seconds: float, jobs: int) -> None:
+    # cached parts report their original timing but cost nothing this run
+    cpu_seconds = sum(r["cpu_seconds"] for r in results if not r.get("cached"))
+    speedup = cpu_seconds / wall_seconds if wall_seconds > 0 else 0.0
+    num_cached = sum(1 for r in results if r.get("cached"))
+    num_timeouts = sum(1 for r in results if r.get("timeout"))
+    print(f"\n=== {len(results)} parts ({num_cached} cached, {num_timeouts} timed out): "
+          f"{wall_seconds:.3f} seconds wall-clock, "
+          f"{cpu_seconds:.3f} seconds summed CPU ({speedup:.2f}x, jobs={jobs}), "
+          f"{sum(import_seconds.values()):.3f} seconds importing ===")
+
+
+def run_day(
+        year: int,
+        day: int,
+        skip_example: bool = False,
+        skip_puzzle: bool = False,
+        part1_only: bool = False,
+        part2_only: bool = False,
+        timeout: float | None = None,
+        **unit_options,
+) -> None:
+    """Runs the solution for a single day. `unit_options` are passed through to `run_unit`."""
+    plan = plan_day(year, day, skip_example, skip_puzzle, part1_only, part2_only)
+    execute_plan(plan, 1, partial(run_unit, **unit_options), timeout=timeout)
+    evict_cache()
+
+
+def _run_many(
+        years: list[int],
+        plan: Plan,
+        flags: tuple[bool, bool, bool, bool],
+        jobs: int,
+        timeout: float | None,
+        shard: tuple[int, int] | None,
+        baseline_path: Path,
+        json_path: Path | None,
+        report: tuple[float, int, Path | None],
+        unit_options: dict,
+) -> None:
+    t0 = time.perf_counter()
+    if shard is not None:
+        plan = plan_shard(years, flags, shard, load_baseline(baseline_path))
+    results = execute_plan(plan, jobs, partial(run_unit, **unit_options), timeout=timeout)
+    wall_seconds = time.perf_counter() - t0
+    report_slowest(results, *report)
+    _print_timing_summary(results, wall_seconds, jobs)
+    if json_path is not None:
+        write_results(json_path, results, wall_seconds, jobs, shard)
+    evict_cache()
+
+
+def run_year(
+        year: int,
+        skip_example: bool = False,
+        skip_puzzle: bool = False,
+        part1_only: bool = False,
+        part2_only: bool = False,
+        jobs: int = 1,
+        timeout: float | None = None,
+        shard: tuple[int, int] | None = None,
+        baseline_path: Path = BASELINE_FILE,
+        json_path: Path | None = None,
+        budget: float = 1.0,
+        report_top: int = 10,
+        report_json: Path | None = None,
+        **unit_options,
+) -> None:
+    """Runs every day of a year, or only its `shard`. `unit_options` are passed through to `run_unit`."""
+    flags = (skip_example, skip_puzzle, part1_only, part2_only)
+    plan = plan_year(year, *flags)
+    if shard is not None and not (SRC_DIR / f"aoc_{year}").exists():
+        shard = None  # let the regular plan report the missing year
+    report = (budget, report_top, report_json)
+    _run_many([year], plan, flags, jobs, timeout, shard, baseline_path, json_path, report, unit_options)
+
+
+def run_all(
+        skip_example: bool = False,
+        skip_puzzle: bool = False,
+        part1_only: bool = False,
+        part2_only: bool = False,
+        jobs: int = 1,
+        timeout: float | None = None,
+        shard: tuple[int, int] | None = None,
+        baseline_path: Path = BASELINE_FILE,
+        json_path: Path | None = None,
+        budget: float = 1.0,
+        report_top: int = 10,
+        report_json: Path | None = None,
+        **unit_options,
+) -> None:
+    """Runs every year, or only its `shard`. `unit_options` are passed through to `run_unit`."""
+    flags = (skip_example, skip_puzzle, part1_only, part2_only)
+    plan = plan_all(*flags)
+    report = (budget, report_top, report_json)
+    _run_many(list_years(), plan, flags, jobs, timeout, shard, baseline_path, json_path, report, unit_options)
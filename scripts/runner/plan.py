@@ -0,0 +1,100 @@
+"""
+Plans: the messages and (year, day, input file, part) units of a run, in the order they're printed.
+"""
+
+from collections.abc import Iterator
+
+from . import SRC_DIR
+from .solutions import day_dir, get_solution, import_seconds, list_days, list_years, loaded_solutions
+
+Plan = Iterator[str | tuple[int, int, str, int]]
+
+
+def plan_day(
+        year: int,
+        day: int,
+        skip_example: bool = False,
+        skip_puzzle: bool = False,
+        part1_only: bool = False,
+        part2_only: bool = False,
+        only_inputs: set[str] | None = None,
+) -> Plan:
+    """
+    Yields the work for a single day, in output order: strings are messages to print and
+    (year, day, input file, part) tuples are units to run. `only_inputs` restricts it to those input files.
+    """
+    base_dir = day_dir(year, day)
+    if not base_dir.exists():
+        yield f"Day directory {base_dir} does not exist"
+        return
+
+    input_dir = base_dir / "input"
+    if not input_dir.exists():
+        yield f"Input directory {input_dir} does not exist"
+        return
+
+    yield f"\n=== Day {day:02d} ===\n"
+
+    already_imported = (year, day) in loaded_solutions
+    try:
+        get_solution(year, day)
+    except Exception as exc:
+        yield f"Skipping day {day:02d}: {exc}"
+        return
+    if not already_imported:
+        yield f"(imported in {import_seconds[(year, day)]:.3} seconds)"
+
+    parts = [p for p in (1, 2) if not (p == 1 and part2_only) and not (p == 2 and part1_only)]
+
+    if not skip_example:
+        example_files = sorted([p.name for p in input_dir.glob("*example*.txt")])
+        if only_inputs is not None:
+            example_files = [f for f in example_files if f in only_inputs]
+        elif not example_files:
+            yield "No example files found."
+        for example_file in example_files:
+            yield f"--- Example ({example_file}) ---"
+            for part in parts:
+                yield (year, day, example_file, part)
+
+    if not skip_puzzle and (only_inputs is None or "puzzle.txt" in only_inputs):
+        puzzle_file = "puzzle.txt"
+        yield f"--- Puzzle ({puzzle_file}) ---"
+        if not (input_dir / puzzle_file).exists():
+            yield f"{puzzle_file} not found."
+        else:
+            for part in parts:
+                yield (year, day, puzzle_file, part)
+
+
+def plan_year(year: int, *args: bool) -> Plan:
+    year_dir = SRC_DIR / f"aoc_{year}"
+    if not year_dir.exists():
+        yield f"Year directory {year_dir} does not exist"
+        return
+
+    days = list_days(year)
+    if not days:
+        yield f"No directories were found matching {year_dir}/day_DD/"
+        return
+
+    for day in days:
+        yield from plan_day(year, day, *args)
+
+
+def plan_all(*args: bool) -> Plan:
+    years = list_years()
+    if not years:
+        yield "No directories were found matching aoc_YYYY/"
+        return
+
+    for year in years:
+        yield from plan_year(year, *args)
+
+
+def plan_for(year: int | None, day: int | None, *args: bool) -> Plan:
+    if year is None:
+        return plan_all(*args)
+    if day is None:
+        return plan_year(year, *args)
+    return plan_day(year, day, *args)
@@ -0,0 +1,243 @@
+"""
+Measuring a single part: wall-clock and CPU time, traced allocations and peak RSS, and cProfile or sampling profiles.
+"""
+
+import cProfile
+import marshal
+import re
+import resource
+import signal
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from collections import Counter, defaultdict
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable
+
+from . import ROOT_DIR
+
+PROFILE_DIR = ROOT_DIR / "profiles"
+
+
+def _max_rss_bytes() -> int:
+    """The process's resident-set high-water mark (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+@contextmanager
+def _track_memory(top_n: int = 5, sample_interval: float = 0.01) -> Iterator[dict]:
+    """
+    Traces allocations made inside the block, filling in the yielded dict on exit.
+
+    tracemalloc only reports the peak size, not where it was allocated, so a background thread snapshots the
+    heap each time it grows by 10% (and at least 64 KiB). The top allocation sites come from the largest of those
+    snapshots, or from one taken on exit if the heap is larger then (or nothing was sampled, as in parts shorter
+    than `sample_interval`); `sites_taken` says which, and `sites_traced_bytes` how much was traced at the time.
+    """
+    stats = {}
+    rss_before = _max_rss_bytes()
+    largest = {"size": 0, "snapshot": None}
+    done = threading.Event()
+
+    def sample() -> None:
+        while not done.wait(sample_interval):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > largest["size"] * 1.1 and current - largest["size"] > 64 << 10:
+                largest["snapshot"] = tracemalloc.take_snapshot()
+                largest["size"] = current
+
+    tracemalloc.start()
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        yield stats
+    finally:
+        done.set()
+        sampler.join()
+        current, peak = tracemalloc.get_traced_memory()
+        on_exit = largest["snapshot"] is None or current >= largest["size"]
+        snapshot = tracemalloc.take_snapshot() if on_exit else largest["snapshot"]
+        tracemalloc.stop()
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, str(Path(__file__).parent / "*")),  # the runner's own bookkeeping
+        ])
+        stats["peak_traced_bytes"] = peak
+        stats["sites_taken"] = "on exit" if on_exit else "near peak"
+        stats["sites_traced_bytes"] = current if on_exit else largest["size"]
+        stats["rss_growth_bytes"] = _max_rss_bytes() - rss_before
+        stats["peak_rss_bytes"] = _max_rss_bytes()
+        stats["top_sites"] = [
+            {"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", "size_bytes": stat.size,
+             "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:top_n]
+        ]
+
+
+def format_bytes(n: int) -> str:
+    for unit, scale in (("GiB", 1 << 30), ("MiB", 1 << 20), ("KiB", 1 << 10)):
+        if abs(n) >= scale:
+            return f"{n / scale:.1f} {unit}"
+    return f"{n} B"
+
+
+def reset_peak_rss() -> bool:
+    """
+    Resets the process's resident-set high-water mark (Linux only, via /proc/self/clear_refs), so the next
+    `peak_rss_bytes()` covers only what ran since. Returns False where that isn't possible.
+    """
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_bytes() -> int:
+    """The resident-set high-water mark: VmHWM where /proc is available, otherwise ru_maxrss."""
+    try:
+        status = Path("/proc/self/status").read_text()
+    except OSError:
+        return _max_rss_bytes()
+    match = re.search(r"^VmHWM:\s+(\d+) kB", status, re.MULTILINE)
+    return int(match[1]) * 1024 if match else _max_rss_bytes()
+
+
+def _code_key(code) -> tuple[str, int, str]:
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+@contextmanager
+def _sample_profile(interval: float = 0.001) -> Iterator[dict]:
+    """
+    A statistical profiler: a SIGPROF timer interrupts the block every `interval` seconds of CPU time and records
+    the Python stack (up to `run_test_case`), so tight loops run at full speed between samples.
+
+    On exit, the yielded dict's "stats" holds the samples in the same layout as `cProfile.Profile.stats`,
+    so they can be saved and loaded with `pstats`. Call counts are sample counts.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        raise RuntimeError("The sampling profiler can only run on the main thread")
+    holder = {}
+    own, cumulative, edges = Counter(), Counter(), defaultdict(Counter)
+
+    def on_sample(signum, frame) -> None:
+        stack = []
+        while frame is not None and frame.f_code is not run_test_case.__code__:
+            stack.append(_code_key(frame.f_code))
+            frame = frame.f_back
+        if not stack:
+            return
+        own[stack[0]] += 1
+        cumulative.update(set(stack))
+        for callee, caller in set(zip(stack, stack[1:])):
+            edges[callee][caller] += 1
+
+    previous_handler = signal.signal(signal.SIGPROF, on_sample)
+    c0 = time.process_time()
+    signal.setitimer(signal.ITIMER_PROF, interval, interval)
+    try:
+        yield holder
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous_handler)
+        # the kernel may deliver timer signals more coarsely than requested, so weight samples by measured CPU time
+        weight = (time.process_time() - c0) / max(sum(own.values()), 1)
+        holder["stats"] = {
+            key: (n, n, own[key] * weight, n * weight,
+                  {caller: (c, c, 0.0, c * weight) for caller, c in edges[key].items()})
+            for key, n in cumulative.items()
+        }
+
+
+@contextmanager
+def _trace_profile() -> Iterator[dict]:
+    """Profiles the block with cProfile, storing its raw stats in the yielded dict's "stats" on exit."""
+    holder = {}
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield holder
+    finally:
+        profiler.disable()
+        profiler.create_stats()
+        holder["stats"] = profiler.stats
+
+
+def summarize_profile(stats: dict, path: Path, sample: bool, top_n: int) -> dict:
+    """Saves raw profile stats as a .pstats file and returns its top functions by cumulative and by own time."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        marshal.dump(stats, f)
+
+    def top(index: int) -> list[dict]:
+        entries = sorted(stats.items(), key=lambda item: item[1][index], reverse=True)[:top_n]
+        return [
+            {"function": f"{Path(filename).name}:{lineno}({name})", "calls": nc, "own_seconds": tt,
+             "cumulative_seconds": ct}
+            for (filename, lineno, name), (_, nc, tt, ct, _) in entries
+        ]
+
+    return {"path": str(path), "mode": "sample" if sample else "trace",
+            "top_cumulative": top(3), "top_own": top(2)}
+
+
+def _cpu_seconds() -> float:
+    """CPU time used by this process and its finished child processes, such as aoc_utils.parallel's workers."""
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def run_test_case(
+        num: int,
+        puzzle_input: Sequence[str],
+        solve_fn: Callable,
+        memory: bool = False,
+        profile: str | None = None,
+) -> dict:
+    """
+    Runs a single part, returning a result record instead of printing it.
+    `profile` is "trace" or "sample"; the raw stats are returned under "profile_stats".
+    """
+    result = {"part": num, "answer": None, "seconds": 0.0, "cpu_seconds": 0.0, "error": None}
+    profiler = {"trace": _trace_profile, "sample": _sample_profile, None: nullcontext}[profile]
+    with _track_memory() if memory else nullcontext() as memory_stats, profiler() as profile_stats:
+        t0, c0 = time.perf_counter(), _cpu_seconds()
+        try:
+            result["answer"] = str(solve_fn(puzzle_input))
+        except Exception:
+            result["error"] = traceback.format_exc()
+        result["seconds"] = time.perf_counter() - t0
+        result["cpu_seconds"] = _cpu_seconds() - c0
+    if memory:
+        result["memory"] = memory_stats
+    if profile is not None:
+        result["profile_stats"] = profile_stats["stats"]
+    return result
+
+
+def print_memory(stats: dict) -> None:
+    print(f"  peak traced: {format_bytes(stats['peak_traced_bytes'])}, "
+          f"RSS high-water mark: {format_bytes(stats['peak_rss_bytes'])} "
+          f"(+{format_bytes(stats['rss_growth_bytes'])})")
+    if stats["top_sites"]:
+        print(f"  top allocation sites, from a snapshot taken {stats['sites_taken']} "
+              f"({format_bytes(stats['sites_traced_bytes'])} traced):")
+    for site in stats["top_sites"]:
+        print(f"    {format_bytes(site['size_bytes']):>10} in {site['count']:>8} blocks  {site['site']}")
+
+
+def print_profile(summary: dict) -> None:
+    calls = "samples" if summary["mode"] == "sample" else "calls"
+    for title, key in (("cumulative", "top_cumulative"), ("own", "top_own")):
+        print(f"  top functions by {title} time ({summary['mode']}):")
+        for entry in summary[key]:
+            print(f"    {entry['cumulative_seconds']:9.3f}s cum {entry['own_seconds']:9.3f}s own "
+                  f"{entry['calls']:>9} {calls}  {entry['function']}")
+    print(f"  saved {summary['path']}")
@@ -0,0 +1,67 @@
+"""
+The slowest-parts report printed after multi-day runs.
+"""
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from .solutions import day_dir
+
+
+@lru_cache(maxsize=None)
+def _todo_speedup_parts(year: int, day: int) -> frozenset[int]:
+    """Parts whose solve_part_N is marked with a `# TODO speedup` comment."""
+    solution_path = day_dir(year, day) / "solution.py"
+    if not solution_path.exists():
+        return frozenset()
+    return frozenset(map(int, re.findall(r"# TODO speedup\s*\ndef solve_part_(\d)", solution_path.read_text())))
+
+
+def _rank_parts(results: list[dict], budget: float) -> list[dict]:
+    """
+    Every part that produced an answer or timed out, slowest first, with its share of the total time and the
+    cumulative share up to it. Cached parts count with their original timing.
+    """
+    timed = sorted((r for r in results if r["error"] is None or r.get("timeout")), key=lambda r: -r["seconds"])
+    total = sum(r["seconds"] for r in timed)
+    ranking, cumulative = [], 0.0
+    for rank, r in enumerate(timed, 1):
+        cumulative += r["seconds"]
+        ranking.append({
+            "rank": rank, "year": r["year"], "day": r["day"], "input": r["input"], "part": r["part"],
+            "seconds": r["seconds"],
+            "share": r["seconds"] / total if total else 0.0,
+            "cumulative_share": cumulative / total if total else 0.0,
+            "over_budget": r["seconds"] > budget,
+            "timeout": bool(r.get("timeout")),
+            "cached": bool(r.get("cached")),
+            "todo_speedup": r["part"] in _todo_speedup_parts(r["year"], r["day"]),
+        })
+    return ranking
+
+
+def _print_slowest(ranking: list[dict], budget: float, top: int) -> None:
+    """Prints the `top` slowest parts (0 for all), always including every part over the budget."""
+    num_over = sum(1 for entry in ranking if entry["over_budget"])
+    shown = ranking if top == 0 else ranking[:max(top, num_over)]
+    print(f"\n=== Slowest parts ({num_over} of {len(ranking)} over the {budget:g}s budget) ===\n")
+    for entry in shown:
+        flags = [flag for flag, on in (("OVER BUDGET", entry["over_budget"]), ("TIMEOUT", entry["timeout"]),
+                                       ("cached", entry["cached"]), ("TODO speedup", entry["todo_speedup"])) if on]
+        print(f"{entry['rank']:>4}  {entry['seconds']:>9.3f}s  {entry['share']:>6.1%}  "
+              f"{entry['cumulative_share']:>6.1%}  {entry['year']} day {entry['day']:02d} part {entry['part']} "
+              f"({entry['input']})"
+              f"{'  ' + ', '.join(flags) if flags else ''}")
+    if len(shown) < len(ranking):
+        print(f"  ... {len(ranking) - len(shown)} faster part(s) not shown")
+
+
+def report_slowest(results: list[dict], budget: float, top: int, report_json: Path | None) -> None:
+    ranking = _rank_parts(results, budget)
+    if ranking:
+        _print_slowest(ranking, budget, top)
+    if report_json is not None:
+        report_json.write_text(json.dumps({"budget_seconds": budget, "parts": ranking}, indent=2) + "\n")
+        print(f"Wrote the ranking of {len(ranking)} parts to {report_json}")
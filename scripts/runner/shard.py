@@ -0,0 +1,98 @@
+"""
+Splitting a run across hosts: every host computes the same deterministic split of the inputs into shards,
+balanced by baseline runtimes when there are any, and `merge` recombines their --json results.
+"""
+
+import json
+import statistics
+from collections import defaultdict
+from pathlib import Path
+
+from .plan import Plan, plan_day
+from .solutions import day_dir, list_days
+
+
+def _shard_items(years: list[int], skip_example: bool, skip_puzzle: bool) -> list[tuple[int, int, str | None]]:
+    """
+    The (year, day, input file) items that shards divide between them, found without importing any solution.
+    Days with no runnable inputs are a single (year, day, None) item, so exactly one shard reports them.
+    """
+    items = []
+    for year in years:
+        for day in list_days(year):
+            input_dir = day_dir(year, day) / "input"
+            files = []
+            if input_dir.exists():
+                if not skip_example:
+                    files += sorted(p.name for p in input_dir.glob("*example*.txt"))
+                if not skip_puzzle and (input_dir / "puzzle.txt").exists():
+                    files.append("puzzle.txt")
+            items += [(year, day, f) for f in files] or [(year, day, None)]
+    return items
+
+
+def _shard_weights(items: list[tuple[int, int, str | None]], baseline: dict[str, dict]) -> list[float] | None:
+    """
+    Estimated runtime of each item: the summed baseline medians of its parts. Items missing from the baseline
+    get the median estimate. Returns None if the baseline knows none of the items.
+    """
+    known = defaultdict(float)
+    for key, entry in baseline.items():
+        year, day = key.split("/")[:2]
+        known[(int(year), int(day), entry["input"])] += entry["median_ns"]
+    weights = [known.get(item) for item in items]
+    estimates = [w for w in weights if w is not None]
+    if not estimates:
+        return None
+    default = statistics.median(estimates)
+    return [default if w is None else w for w in weights]
+
+
+def _assign_shards(num_items: int, count: int, weights: list[float] | None) -> list[int]:
+    """
+    The 0-based shard of each item. With weights, each item (heaviest first) goes to the least-loaded shard;
+    without, items are dealt round-robin. Ties break by position, so every host computes the same split.
+    """
+    if weights is None:
+        return [i % count for i in range(num_items)]
+    shards, loads = [0] * num_items, [0.0] * count
+    for i in sorted(range(num_items), key=lambda i: (-weights[i], i)):
+        shard = min(range(count), key=lambda s: (loads[s], s))
+        shards[i] = shard
+        loads[shard] += weights[i]
+    return shards
+
+
+def plan_shard(
+        years: list[int], flags: tuple[bool, bool, bool, bool], shard: tuple[int, int], baseline: dict[str, dict],
+) -> Plan:
+    """Plans only the inputs that fall in `shard` (1-based index, count), in the usual order."""
+    index, count = shard
+    items = _shard_items(years, *flags[:2])
+    weights = _shard_weights(items, baseline)
+    assigned = [item for item, s in zip(items, _assign_shards(len(items), count, weights)) if s == index - 1]
+    how = "round-robin, no baseline" if weights is None else "balanced by baseline runtimes"
+    yield f"Shard {index}/{count}: {len(assigned)} of {len(items)} items ({how})"
+    by_day = defaultdict(set)
+    for year, day, filename in assigned:
+        by_day[(year, day)].add(filename)
+    for (year, day), filenames in by_day.items():
+        only_inputs = None if None in filenames else filenames
+        yield from plan_day(year, day, *flags, only_inputs=only_inputs)
+
+
+def write_results(
+        path: Path, results: list[dict], wall_seconds: float, jobs: int, shard: tuple[int, int] | None,
+) -> None:
+    path.write_text(json.dumps({
+        "shard": list(shard) if shard is not None else None,
+        "jobs": jobs,
+        "wall_seconds": wall_seconds,
+        "results": results,
+    }, indent=2) + "\n")
+    print(f"Wrote {len(results)} results to {path}")
+
+
+def result_order(result: dict) -> tuple:
+    # the order runs print in: examples (sorted) before the puzzle input
+    return result["year"], result["day"], result["input"] == "puzzle.txt", result["input"], result["part"]
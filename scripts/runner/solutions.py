@@ -0,0 +1,194 @@
+"""
+Loading solutions and their inputs: one import per day per process, alternative `solution_<name>.py` variants and
+the two-phase `parse` protocol, whose result is shared between both parts of an input.
+"""
+
+import copy
+import hashlib
+import inspect
+import re
+import sys
+import time
+from collections.abc import Sequence
+from functools import partial
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+import aoc_utils
+from aoc_utils.lazy_import import _LazyModule
+
+from . import SRC_DIR
+
+
+def read_puzzle_input(base_dir: Path, filename: str) -> aoc_utils.PuzzleInput | None:
+    """Memory-maps the input file; solutions get a lazily decoded sequence of its lines."""
+
+    filepath = base_dir / filename
+    if not filepath.exists():
+        print(f"{filename} not found.")
+        return None
+
+    try:
+        # looked up on each call, so watch mode picks up a reloaded PuzzleInput
+        puzzle_input = aoc_utils.PuzzleInput.from_file(filepath)
+        return puzzle_input
+    except Exception as exc:
+        print(f"Failed to read {filepath}: {exc}")
+        return None
+
+
+def solution_module_name(year: int, day: int, variant: str | None = None) -> str:
+    suffix = f"_{variant}" if variant is not None else ""
+    return f"aoc_{year}_day_{day:02d}_solution{suffix}"
+
+
+def find_solution_variants(year: int, day: int) -> list[str]:
+    """
+    Names of a day's alternative solutions: `solution_<name>.py` files next to its solution.py,
+    loadable with `load_solution_module(year, day, name)`.
+    """
+    return sorted(p.stem.removeprefix("solution_") for p in day_dir(year, day).glob("solution_*.py"))
+
+
+def load_solution_module(year: int, day: int, variant: str | None = None) -> tuple[Callable, Callable]:
+    filename = f"solution_{variant}.py" if variant is not None else "solution.py"
+    solution_path = (day_dir(year, day) / filename).resolve()
+    if not solution_path.exists():
+        raise FileNotFoundError(f"{solution_path} does not exist")
+
+    module_name = solution_module_name(year, day, variant)
+    spec = spec_from_file_location(module_name, solution_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Couldn't create import spec for {solution_path}")
+    module = module_from_spec(spec)  # type: ignore
+
+    try:
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)  # type: ignore
+    except Exception as exc:
+        # cleanup any partially-registered module to avoid confusing subsequent imports
+        sys.modules.pop(module_name, None)
+        raise RuntimeError(f"Failed to import {solution_path}: {exc}")
+
+    if not hasattr(module, "solve_part_1") or not hasattr(module, "solve_part_2"):
+        raise AttributeError(f"{module_name} missing solve_part_1/solve_part_2")
+
+    if not callable(module.solve_part_1) or not callable(module.solve_part_2):
+        raise TypeError("solve_part_1 and solve_part_2 must be callable")
+
+    return module.solve_part_1, module.solve_part_2
+
+
+loaded_solutions: dict[tuple[int, int], tuple[Callable, Callable]] = {}
+
+
+import_seconds: dict[tuple[int, int], float] = {}
+
+
+def _preload_lazy_modules(module: ModuleType) -> None:
+    """
+    Imports the modules a solution can reach through `lazy_import`, its own and those of the aoc_utils modules
+    it uses (Grid's numpy), so they load as part of the import rather than inside a part's timing and profile.
+    """
+    owners = {module} | {
+        sys.modules[value.__module__] for value in vars(module).values()
+        if getattr(value, "__module__", None) in sys.modules and value.__module__.startswith("aoc_utils.")
+    }
+    for owner in owners:
+        for value in list(vars(owner).values()):
+            if isinstance(value, _LazyModule):
+                getattr(value, "__file__", None)  # any attribute the stand-in doesn't have yet imports the module
+
+
+def get_solution(year: int, day: int) -> tuple[Callable, Callable]:
+    """
+    Loads a day's solution once per process; worker processes reuse it for every unit of that day.
+    The time spent importing it (including any new dependencies, even lazily imported ones) is recorded in
+    `import_seconds`.
+    """
+    if (year, day) not in loaded_solutions:
+        t0 = time.perf_counter()
+        loaded_solutions[(year, day)] = load_solution_module(year, day)
+        _preload_lazy_modules(sys.modules[solution_module_name(year, day)])
+        import_seconds[(year, day)] = time.perf_counter() - t0
+    return loaded_solutions[(year, day)]
+
+
+def module_two_phase_parse(module) -> Callable | None:
+    """
+    Returns the module's `parse` if it opts into the two-phase protocol by setting `TWO_PHASE = True`: `parse`
+    then runs once per input and `solve_part_1(parsed)` / `solve_part_2(parsed)` receive its result.
+    The flag is needed because several days already define a `parse` helper of their own.
+    """
+    parse = getattr(module, "parse", None)
+    return parse if getattr(module, "TWO_PHASE", False) is True and callable(parse) else None
+
+
+def get_two_phase_parse(year: int, day: int) -> Callable | None:
+    """Returns the day's two-phase `parse` (see `module_two_phase_parse`), or None if it doesn't opt in."""
+    get_solution(year, day)
+    return module_two_phase_parse(sys.modules[solution_module_name(year, day)])
+
+
+def get_parse_fn(year: int, day: int, part: int) -> Callable | None:
+    """
+    Returns a one-argument callable wrapping the day's `parse` or `parse_input`, or None if it defines neither.
+    Handles both the `parse_input(puzzle_input)` and `parse_input(puzzle_input, part_2)` signatures.
+    """
+    if (parse := get_two_phase_parse(year, day)) is not None:
+        return parse
+    parse_input = getattr(sys.modules[solution_module_name(year, day)], "parse_input", None)
+    if not callable(parse_input):
+        return None
+    if len(inspect.signature(parse_input).parameters) >= 2:
+        return partial(parse_input, part_2=(part == 2))
+    return parse_input
+
+
+def _is_immutable(obj: object) -> bool:
+    if isinstance(obj, (str, bytes, int, float, complex, bool, range, type(None))):
+        return True
+    if isinstance(obj, (tuple, frozenset)):
+        return all(_is_immutable(o) for o in obj)
+    return False
+
+
+# the most recent two-phase parse result: (year, day, input hash) -> (parsed, parse seconds, immutable)
+parsed_input: dict[tuple[int, int, str], tuple[object, float, bool]] = {}
+
+
+def parse_once(year: int, day: int, input_hash: str, puzzle_input: Sequence[str]) -> tuple[Callable, float, bool]:
+    """
+    Parses an input with the day's two-phase `parse`, reusing the result for the other part of the same input.
+    Returns a callable producing the argument for a part (the parse result itself when it is immutable, otherwise
+    a fresh deep copy), the parse time, and whether the parse was reused.
+    """
+    key = (year, day, input_hash)
+    reused = key in parsed_input
+    if not reused:
+        t0 = time.perf_counter()
+        parsed = get_two_phase_parse(year, day)(puzzle_input)
+        parse_seconds = time.perf_counter() - t0
+        parsed_input.clear()  # only keep one parsed input alive at a time
+        parsed_input[key] = (parsed, parse_seconds, _is_immutable(parsed))
+    parsed, parse_seconds, immutable = parsed_input[key]
+    return (lambda: parsed) if immutable else partial(copy.deepcopy, parsed), parse_seconds, reused
+
+
+def day_dir(year: int, day: int) -> Path:
+    return SRC_DIR / f"aoc_{year}" / f"day_{day:02d}"
+
+
+def list_years() -> list[int]:
+    return sorted(int(d.name[4:]) for d in SRC_DIR.iterdir() if d.is_dir() and re.match(r"aoc_\d{4}$", d.name))
+
+
+def list_days(year: int) -> list[int]:
+    year_dir = SRC_DIR / f"aoc_{year}"
+    return sorted(int(d.name[4:]) for d in year_dir.iterdir() if d.is_dir() and re.match(r"day_\d{2}$", d.name))
+
+
+def hash_input(filepath: Path) -> str:
+    return hashlib.sha256(filepath.read_bytes()).hexdigest()[:16]
@@ -0,0 +1,87 @@
+"""
+`run.py watch`: one warm process that reloads changed code and re-runs a day on every save.
+"""
+
+import ast
+import importlib
+import sys
+import time
+import traceback
+from functools import partial
+from pathlib import Path
+
+from . import UTILS_DIR
+from .cache import solution_fingerprint
+from .execution import execute_plan, run_unit
+from .plan import plan_day
+from .solutions import day_dir, import_seconds, loaded_solutions, parsed_input, solution_module_name
+
+
+def _watched_files(year: int, day: int) -> dict[Path, int]:
+    """Modification times of everything a day's results depend on: its solution, its inputs and aoc_utils."""
+    base_dir = day_dir(year, day)
+    paths = [base_dir / "solution.py", *(base_dir / "input").glob("*.txt"), *UTILS_DIR.glob("*.py")]
+    return {path: path.stat().st_mtime_ns for path in paths if path.exists()}
+
+
+def _forget_solution(year: int, day: int) -> None:
+    """Drops everything cached about a day's solution so the next run re-imports it."""
+    loaded_solutions.pop((year, day), None)
+    import_seconds.pop((year, day), None)
+    sys.modules.pop(solution_module_name(year, day), None)
+    solution_fingerprint.cache_clear()
+    parsed_input.clear()
+
+
+def _reload_utils(changed: list[Path]) -> None:
+    """
+    Reloads the changed aoc_utils modules, then the aoc_utils modules that import them and the package itself,
+    so `from aoc_utils import ...` picks up the new definitions. Modules that were never imported are skipped.
+    """
+    changed_names = {path.stem for path in changed if path.stem != "__init__"}
+    dependents = []
+    for path in sorted(UTILS_DIR.glob("*.py")):
+        if path.stem in changed_names or path.stem == "__init__":
+            continue
+        imported = {node.module for node in ast.walk(ast.parse(path.read_text())) if isinstance(node, ast.ImportFrom)}
+        if imported & changed_names:
+            dependents.append(path.stem)
+    for name in [*sorted(changed_names), *dependents]:
+        if f"aoc_utils.{name}" in sys.modules:
+            importlib.reload(sys.modules[f"aoc_utils.{name}"])
+    # submodules are reloaded in place, so the runner's `memo` and `instrumentation` references stay current
+    importlib.reload(sys.modules["aoc_utils"])
+
+
+def watch_day(year: int, day: int, flags: tuple[bool, bool, bool, bool], interval: float) -> None:
+    """
+    Runs a day, then polls its solution, inputs and aoc_utils, reloading whatever changed in this same process
+    and re-running the affected parts: every input if code changed, otherwise only the changed inputs.
+    """
+    run_fn = partial(run_unit, cache=False)
+    execute_plan(plan_day(year, day, *flags), 1, run_fn)
+    mtimes = _watched_files(year, day)
+    print(f"\nWatching {day_dir(year, day)} and {UTILS_DIR} (Ctrl-C to stop)")
+
+    while True:
+        time.sleep(interval)
+        new_mtimes = _watched_files(year, day)
+        changed = [path for path in new_mtimes.keys() | mtimes.keys() if new_mtimes.get(path) != mtimes.get(path)]
+        mtimes = new_mtimes
+        if not changed:
+            continue
+
+        print(f"\n>>> Changed: {', '.join(sorted(path.name for path in changed))}")
+        changed_utils = [path for path in changed if path.parent == UTILS_DIR]
+        changed_inputs = {path.name for path in changed if path.parent.name == "input"}
+        code_changed = bool(changed_utils) or any(path.name == "solution.py" for path in changed)
+        try:
+            if changed_utils:
+                _reload_utils(changed_utils)
+            if code_changed:
+                _forget_solution(year, day)
+        except Exception:
+            traceback.print_exc()
+            continue
+        parsed_input.clear()
+        execute_plan(plan_day(year, day, *flags, only_inputs=None if code_changed else changed_inputs), 1, run_fn)
@@ -21,11 +21,12 @@ from pathlib import Path
 from statistics import median
 from typing import Callable, Iterable, Iterator, Literal
 
-import click
-import numpy
-import regex
+from aoc_utils import DirectedGraph, DirectedWeightedGraph, Grid, IntRangeMap, IntRangeSet, lazy_import
 
-from aoc_utils import DirectedGraph, DirectedWeightedGraph, Grid, IntRangeMap, IntRangeSet
+# heavy dependencies are only imported the first time they're used
+click = lazy_import("click")
+numpy = lazy_import("numpy")
+regex = lazy_import("regex")
 
 
 def parse_input(puzzle_input: list[str], part_2: bool):
@@ -6,6 +6,8 @@ Day 10: Adapter Array
 from collections import defaultdict
 from math import prod
 
+from aoc_utils import memoize
+
 
 def get_numbers(puzzle_input):
     numbers = [int(n) for n in puzzle_input]
@@ -20,18 +22,17 @@ def get_differences(numbers):
     return d[1], d[3]
 
 
-def num_arrangements(numbers, last, memo={}):
+@memoize
+def num_arrangements(numbers: tuple[int, ...], last: int):
     n = len(numbers)
     if n in {0, 1}:
         return 1
-    if (n, last) not in memo:
-        ways = 0
-        i = 0
-        while i < len(numbers) and numbers[i] <= last + 3:
-            ways += num_arrangements(numbers[i + 1:], numbers[i])
-            i += 1
-        memo[(n, last)] = ways
-    return memo[(n, last)]
+    ways = 0
+    i = 0
+    while i < len(numbers) and numbers[i] <= last + 3:
+        ways += num_arrangements(numbers[i + 1:], numbers[i])
+        i += 1
+    return ways
 
 
 def solve_part_1(puzzle_input: list[str]):
@@ -41,4 +42,4 @@ def solve_part_1(puzzle_input: list[str]):
 
 def solve_part_2(puzzle_input: list[str]):
     numbers = get_numbers(puzzle_input)
-    return num_arrangements(sorted(numbers), 0)
+    return num_arrangements(tuple(sorted(numbers)), 0)
@@ -3,9 +3,12 @@ Advent of Code 2022
 Day 19: Not Enough Minerals
 """
 
+import operator
 import re
 from collections import deque
 
+from aoc_utils import map_reduce
+
 
 class Blueprint:
     def __init__(self, row):
@@ -101,17 +104,20 @@ def max_num_geodes(blueprint: Blueprint, init_materials, init_robots, total_time
     return max_geodes, best_path
 
 
+def quality_level(blueprint: Blueprint) -> int:
+    max_geodes, _ = max_num_geodes(blueprint, (0, 0, 0, 0), (1, 0, 0, 0), 24)
+    return max_geodes * blueprint.id
+
+
+def max_geodes_in_32_minutes(blueprint: Blueprint) -> int:
+    max_geodes, _ = max_num_geodes(blueprint, (0, 0, 0, 0), (1, 0, 0, 0), 32)
+    return max_geodes
+
+
+# each blueprint is a search of its own, so it's worth a worker even when there are only a few
 def solve_part_1(puzzle_input: list[str]):
-    quality = []
-    for blueprint in parse(puzzle_input):
-        max_geodes, _ = max_num_geodes(blueprint, (0, 0, 0, 0), (1, 0, 0, 0), 24)
-        quality.append(max_geodes * blueprint.id)
-    return sum(quality)
+    return map_reduce(parse(puzzle_input), quality_level, operator.add, 0, parallel=True)
 
 
 def solve_part_2(puzzle_input: list[str]):
-    product = 1
-    for blueprint in parse(puzzle_input[:3]):
-        max_geodes, _ = max_num_geodes(blueprint, (0, 0, 0, 0), (1, 0, 0, 0), 32)
-        product *= max_geodes
-    return product
+    return map_reduce(parse(puzzle_input[:3]), max_geodes_in_32_minutes, operator.mul, 1, parallel=True)
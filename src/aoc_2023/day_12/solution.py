@@ -3,7 +3,9 @@ Advent of Code 2023
 Day 12: Hot Springs
 """
 
-from functools import lru_cache
+import operator
+
+from aoc_utils import map_reduce, memoize
 
 
 def parse_input(puzzle_input: list[str], part_2: bool) -> list[tuple[str, list[int]]]:
@@ -18,7 +20,7 @@ def parse_input(puzzle_input: list[str], part_2: bool) -> list[tuple[str, list[i
     return values
 
 
-@lru_cache(None)
+@memoize
 def num_arrangements(line: str, criteria: tuple[int]) -> int:
 
     if len(line) == 0:
@@ -51,19 +53,16 @@ def num_arrangements(line: str, criteria: tuple[int]) -> int:
     return num_arrangements(f"#{line[1:]}", criteria) + num_arrangements(line[1:], criteria)
 
 
+def num_record_arrangements(value: tuple[str, list[int]]) -> int:
+    record, criteria = value
+    return num_arrangements(record, tuple(criteria))
+
+
 def solve_part_1(puzzle_input: list[str]):
     values = parse_input(puzzle_input, False)
-    total_num_arrangements = []
-    for record, criteria in values:
-        n = num_arrangements(record, tuple(criteria))
-        total_num_arrangements.append(n)
-    return sum(total_num_arrangements)
+    return map_reduce(values, num_record_arrangements, operator.add, 0)
 
 
 def solve_part_2(puzzle_input: list[str]):
     values = parse_input(puzzle_input, True)
-    total_num_arrangements = []
-    for record, criteria in values:
-        n = num_arrangements(record, tuple(criteria))
-        total_num_arrangements.append(n)
-    return sum(total_num_arrangements)
+    return map_reduce(values, num_record_arrangements, operator.add, 0)
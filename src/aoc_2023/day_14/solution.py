@@ -53,12 +53,8 @@ def tilt(g: Grid, direction: Literal["N", "S", "E", "W"]) -> Grid:
 
 
 def total_load(g: Grid) -> int:
-    tot = 0
-    for j in range(g.width):
-        for i in range(g.height):
-            if g.at(i, j) == "O":
-                tot += (g.height - i)
-    return tot
+    rows_of_round_rocks = (g.to_numpy() == ord("O")).nonzero()[0]
+    return int((g.height - rows_of_round_rocks).sum())
 
 
 def cycle_n_times(g: Grid, n: int) -> Grid:
@@ -13,13 +13,9 @@ def parse_input(puzzle_input: list[str], part_2: bool):
 def solve_part_1(puzzle_input: list[str]):
     grid = parse_input(puzzle_input, False)
     start = grid.where("S")[0]
-    dists = grid.dijkstra(start)
-    num_reachable = 0
     num_steps = 64
-    for _, v in dists.items():
-        if v in {num_steps - 2 * i for i in range(num_steps // 2 + 1)}:
-            num_reachable += 1
-    return num_reachable
+    dists = grid.bfs(start, max_dist=num_steps)
+    return int(((dists >= 0) & (dists % 2 == num_steps % 2)).sum())
 
 
 def solve_part_2(puzzle_input: list[str]):
@@ -36,11 +32,14 @@ def solve_part_2(puzzle_input: list[str]):
         raise NotImplementedError("Solution does not work when number of steps is not whole number of plots")
 
     # Note: the number of plots we can reach happens to follow a quadratic curve
+    # a 5x5 tiling holds the longest of the three walks from the centre tile, so one bfs serves all of them
+    max_path_lengths = [num_grids * grid.width + grid.width // 2 for num_grids in range(3)]
+    centre = (start[0] + 2 * grid.height, start[1] + 2 * grid.width)
+    dists = grid.repeat(5, 5).bfs(centre, max_dist=max_path_lengths[-1])
     num_reachable = {}
-    for num_grids in range(3):
-        max_path_length = num_grids * grid.width + grid.width // 2
-        dists = grid.dijkstra(start, max_path_length=max_path_length, allow_wrap_around=True)
-        num_reachable[num_grids] = len([v for v in dists.values() if v % 2 == max_path_length % 2])
+    for num_grids, max_path_length in enumerate(max_path_lengths):
+        reached = (dists >= 0) & (dists <= max_path_length) & (dists % 2 == max_path_length % 2)
+        num_reachable[num_grids] = int(reached.sum())
     n0, n1, n2 = num_reachable[0], num_reachable[1], num_reachable[2]
 
     a = (n2 - 2 * n1 + n0) // 2
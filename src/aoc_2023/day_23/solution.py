@@ -18,6 +18,7 @@ def parse_input(puzzle_input: list[str], part_2: bool):
 
     grid.set(0, start, "S")
     grid.set(len(puzzle_input) - 1, end, "E")
+    grid.adjacency()  # the grid is static from here on, so neighbors() can use the precomputed table
     return grid
 
 
@@ -51,8 +52,8 @@ def solve_part_1(puzzle_input: list[str]):
 
 def build_graph(grid: Grid) -> dict[tuple[int, int], dict[tuple[int, int], int]]:
     nodes = {
-        (i, j) for (i, j) in grid
-        if grid.at(i, j) != "#" and len(list(grid.neighbors((i, j)))) != 2
+        (i, j) for i, j, val in grid.iter_cells()
+        if val != "#" and len(list(grid.neighbors((i, j)))) != 2
     }
 
     graph = {n: {} for n in nodes}
@@ -3,6 +3,12 @@ Advent of Code 2024
 Day 7: Bridge Repair
 """
 
+import operator
+from functools import partial
+
+from aoc_utils import map_reduce
+
+
 def parse_input(puzzle_input: list[str]):
     equations = []
     for line in puzzle_input:
@@ -42,19 +48,16 @@ def can_be_true(value: int, nums: tuple[int], memo: dict, part_2: bool) -> bool:
     return False
 
 
+def calibration_value(equation: tuple[int, tuple[int]], part_2: bool) -> int:
+    value, nums = equation
+    return value if can_be_true(value, nums, {}, part_2) else 0
+
+
 def solve_part_1(puzzle_input: list[str]):
     equations = parse_input(puzzle_input)
-    tot = 0
-    for (value, nums) in equations:
-        if can_be_true(value, nums, {}, False):
-            tot += value
-    return tot
+    return map_reduce(equations, partial(calibration_value, part_2=False), operator.add, 0)
 
 
 def solve_part_2(puzzle_input: list[str]):
     equations = parse_input(puzzle_input)
-    tot = 0
-    for (value, nums) in equations:
-        if can_be_true(value, nums, {}, True):
-            tot += value
-    return tot
+    return map_reduce(equations, partial(calibration_value, part_2=True), operator.add, 0)
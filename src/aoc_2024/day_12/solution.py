@@ -25,13 +25,14 @@ def fill_region(g: Grid, i: int, j: int) -> set[tuple[int, int]]:
 
 def get_all_regions(puzzle_input: list[str]) -> Iterator[tuple[int, int]]:
     g = Grid.from_puzzle_input(puzzle_input)
-    all_seen = set()
-    for (i, j) in g:
-        if (i, j) in all_seen:
+    seen = bytearray(g.height * g.width)  # by flat index, so the scan needs no (i, j) tuples
+    for k in g.iter_indices():
+        if seen[k]:
             continue
-        region = fill_region(g, i, j)
+        region = fill_region(g, *divmod(k, g.width))
         yield region
-        all_seen |= region
+        for (i, j) in region:
+            seen[i * g.width + j] = 1
 
 
 UndirectedEdge = tuple[tuple[int, int], tuple[int, int]]
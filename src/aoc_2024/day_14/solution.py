@@ -8,8 +8,10 @@ from math import prod
 
 import regex as re
 
+TWO_PHASE = True  # solve_part_1/solve_part_2 receive the result of parse()
 
-def parse_input(puzzle_input: list[str]):
+
+def parse(puzzle_input: list[str]):
     width = int(re.match(r"width=(?P<width>\d+)", puzzle_input[0]).group('width'))
     height = int(re.match(r"height=(?P<height>\d+)", puzzle_input[1]).group('height'))
     run_part_2 = puzzle_input[2] == "True"
@@ -19,7 +21,7 @@ def parse_input(puzzle_input: list[str]):
         pos = (int(match.group("px")), int(match.group("py")))
         vel = (int(match.group("vx")), int(match.group("vy")))
         robots.add((pos, vel))
-    return robots, width, height, run_part_2
+    return frozenset(robots), width, height, run_part_2
 
 
 def print_robots(robots, width, height):
@@ -82,15 +84,15 @@ def overlap(robots):
     return False
 
 
-def solve_part_1(puzzle_input: list[str]):
-    robots, width, height, _ = parse_input(puzzle_input)
+def solve_part_1(parsed):
+    robots, width, height, _ = parsed
     for _ in range(100):
         robots = timestamp(robots, width, height)
     return calc_safety_score(robots, width, height)
 
 
-def solve_part_2(puzzle_input: list[str]):
-    robots, width, height, run_part_2 = parse_input(puzzle_input)
+def solve_part_2(parsed):
+    robots, width, height, run_part_2 = parsed
     if not run_part_2:
         return
     i = 0
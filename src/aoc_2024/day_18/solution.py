@@ -35,8 +35,7 @@ def coords_to_grid(coords: set[tuple[int, int]]) -> Grid:
 
 
 def path_exists(grid: Grid, start: tuple[int, int], end: tuple[int, int]) -> bool:
-    dists = grid.dijkstra(start)
-    return end in dists
+    return grid.bfs(start, target=end)[end] != -1
 
 
 def solve_part_1(puzzle_input: list[str]):
@@ -44,7 +43,7 @@ def solve_part_1(puzzle_input: list[str]):
     grid = coords_to_grid(coords)
     start = (0, 0)
     end = (grid.width - 1, grid.height - 1)
-    return grid.dijkstra(start)[end]
+    return int(grid.bfs(start, target=end)[end])
 
 
 def solve_part_2(puzzle_input: list[str]):
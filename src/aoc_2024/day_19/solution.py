@@ -3,32 +3,31 @@ Advent of Code 2024
 Day 19: Linen Layout
 """
 
+from aoc_utils import memoize
+
+
 def parse_input(puzzle_input: list[str]):
-    available_patterns = puzzle_input[0].split(", ")
+    available_patterns = frozenset(puzzle_input[0].split(", "))  # hashable, so num_ways can be memoized on it
     desired_designs = puzzle_input[2:]
     return available_patterns, desired_designs
 
 
-def num_ways(design: str, available_patterns: list[str], memo={}) -> int:
-    if design in memo:
-        return memo[design]
-
+@memoize
+def num_ways(design: str, available_patterns: frozenset[str]) -> int:
     n = 0
     for p in available_patterns:
         if design == p:
             n += 1
         elif design.startswith(p):
-            n += num_ways(design.removeprefix(p), available_patterns, memo)
-
-    memo[design] = n
+            n += num_ways(design.removeprefix(p), available_patterns)
     return n
 
 
 def solve_part_1(puzzle_input: list[str]):
     available_patterns, desired_designs = parse_input(puzzle_input)
-    return len([d for d in desired_designs if num_ways(d, available_patterns, {}) > 0])
+    return len([d for d in desired_designs if num_ways(d, available_patterns) > 0])
 
 
 def solve_part_2(puzzle_input: list[str]):
     available_patterns, desired_designs = parse_input(puzzle_input)
-    return sum([num_ways(d, available_patterns, {}) for d in desired_designs])
+    return sum([num_ways(d, available_patterns) for d in desired_designs])
@@ -36,18 +36,18 @@ def get_times_saved(g: Grid, max_cheat_len: int) -> dict[int, int]:
     start = g.where("S")[0]
     end = g.where("E")[0]
 
-    dists_from_start = g.dijkstra(start)
-    dists_from_end = g.dijkstra(end)
-    len_without_cheating = dists_from_start[end]
+    dists_from_start = g.bfs(start)
+    dists_from_end = g.bfs(end).tolist()
+    len_without_cheating = int(dists_from_start[end])
 
-    path = sorted(dists_from_start, key=dists_from_start.get)
+    path = sorted(g.where(mask=dists_from_start >= 0), key=lambda loc: dists_from_start[loc])
 
     time_saved_dict = defaultdict(int)
     for start_t, start in enumerate(path):
         for end_t, end in enumerate(path):
             if start_t + 3 <= end_t:
                 cheat_len = abs(end[0] - start[0]) + abs(end[1] - start[1])
-                dist_with_cheat = start_t + cheat_len + dists_from_end[end]
+                dist_with_cheat = start_t + cheat_len + dists_from_end[end[0]][end[1]]
                 if cheat_len <= max_cheat_len and start_t + cheat_len < end_t:
                     time_saved = len_without_cheating - dist_with_cheat
                     time_saved_dict[time_saved] += 1
@@ -3,8 +3,11 @@ Advent of Code 2024
 Day 22: Monkey Market
 """
 
+import operator
 from collections import defaultdict
 
+from aoc_utils import map_reduce
+
 N_SECRET_NUMS = 2000
 
 
@@ -27,13 +30,14 @@ def calc_next_secret_number(secret_number: int) -> int:
     return secret_number
 
 
+def final_secret_number(secret_number: int) -> int:
+    for _ in range(N_SECRET_NUMS):
+        secret_number = calc_next_secret_number(secret_number)
+    return secret_number
+
+
 def solve_part_1(puzzle_input: list[str]):
-    tot = 0
-    for secret_number in parse_input(puzzle_input):
-        for _ in range(N_SECRET_NUMS):
-            secret_number = calc_next_secret_number(secret_number)
-        tot += secret_number
-    return tot
+    return map_reduce(parse_input(puzzle_input), final_secret_number, operator.add, 0)
 
 
 def solve_part_2(puzzle_input: list[str]):
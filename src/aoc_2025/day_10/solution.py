@@ -4,10 +4,13 @@ Day 10: Factory
 """
 
 import ast
+import operator
 
 import numpy as np
 from scipy.optimize import Bounds, LinearConstraint, milp
 
+from aoc_utils import map_reduce, memoize
+
 
 def parse_input(puzzle_input: list[str], part_2: bool):
     machines = []
@@ -20,27 +23,24 @@ def parse_input(puzzle_input: list[str], part_2: bool):
     return machines
 
 
-def fewest_button_presses_part_1(indicator_lights: str, buttons: set[tuple[int, ...]], memo: dict = {}) -> float:
-    memo_key = (indicator_lights, tuple(sorted(buttons)))
-    if memo_key not in memo:
-        if all(ch == "." for ch in indicator_lights):
-            memo[memo_key] = 0
-        elif len(buttons) == 0:
-            memo[memo_key] = np.inf
-        else:
-            options = []
-            for b in buttons:
-                new_lights = "".join(
-                    ch if i not in b else {".": "#", "#": "."}[ch]
-                    for i, ch in enumerate(indicator_lights)
-                )
-                new_buttons = buttons - {b}  # will never need to press the same button twice
-                options.append(1 + fewest_button_presses_part_1(new_lights, new_buttons, memo))
-            memo[memo_key] = min(options)
-    return memo[memo_key]
-
-
-def fewest_button_presses_part_2(joltage_reqs: tuple[int, ...], buttons: list[tuple[int, ...]], memo: dict = {}) -> float:
+@memoize(key=lambda indicator_lights, buttons: (indicator_lights, tuple(sorted(buttons))))
+def fewest_button_presses_part_1(indicator_lights: str, buttons: set[tuple[int, ...]]) -> float:
+    if all(ch == "." for ch in indicator_lights):
+        return 0
+    if len(buttons) == 0:
+        return np.inf
+    options = []
+    for b in buttons:
+        new_lights = "".join(
+            ch if i not in b else {".": "#", "#": "."}[ch]
+            for i, ch in enumerate(indicator_lights)
+        )
+        new_buttons = buttons - {b}  # will never need to press the same button twice
+        options.append(1 + fewest_button_presses_part_1(new_lights, new_buttons))
+    return min(options)
+
+
+def fewest_button_presses_part_2(joltage_reqs: tuple[int, ...], buttons: list[tuple[int, ...]]) -> float:
     # solve Ax = b where A describes buttons and b describes joltage reqs
     m, n = len(joltage_reqs), len(buttons)
     A = np.array([[1 if i in button else 0 for i in range(m)] for button in buttons], dtype=int).T
@@ -54,17 +54,21 @@ def fewest_button_presses_part_2(joltage_reqs: tuple[int, ...], buttons: list[tu
     return int(res.x.sum())
 
 
+def machine_presses_part_1(machine: tuple[str, list[tuple[int, ...]], tuple[int, ...]]) -> float:
+    indicator_lights, buttons, _ = machine
+    return fewest_button_presses_part_1(indicator_lights, set(buttons))
+
+
+def machine_presses_part_2(machine: tuple[str, list[tuple[int, ...]], tuple[int, ...]]) -> float:
+    _, buttons, joltage_reqs = machine
+    return fewest_button_presses_part_2(joltage_reqs, buttons)
+
+
 def solve_part_1(puzzle_input: list[str]):
     machines = parse_input(puzzle_input, False)
-    total_presses = 0
-    for (indicator_lights, buttons, _) in machines:
-        total_presses += fewest_button_presses_part_1(indicator_lights, set(buttons))
-    return total_presses
+    return map_reduce(machines, machine_presses_part_1, operator.add, 0)
 
 
 def solve_part_2(puzzle_input: list[str]):
     machines = parse_input(puzzle_input, True)
-    total_presses = 0
-    for (_, buttons, joltage_reqs) in machines:
-        total_presses += fewest_button_presses_part_2(joltage_reqs, buttons)
-    return total_presses
+    return map_reduce(machines, machine_presses_part_2, operator.add, 0)
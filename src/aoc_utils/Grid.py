@@ -1,79 +1,407 @@
 import heapq
-from typing import Iterable
+from collections import deque
+from functools import lru_cache
+from itertools import compress, count, product, repeat
+from typing import Callable, Collection, Iterable, Iterator
+
+from .lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+EMPTY = 0  # byte stored for cells that were never set, e.g. past the end of a short row
+EIGHT_NEIGHBORS = ((1, 1, 1), (1, 0, 1), (1, 1, 1))
+FOUR_NEIGHBORS = ((0, 1, 0), (1, 0, 1), (0, 1, 0))
+
+# (di, dj) of the neighbors for each connectivity, orthogonal ones first
+DIRECTIONS = {
+    4: ((1, 0), (-1, 0), (0, 1), (0, -1)),
+    8: ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)),
+}
+
+_CHARS = [chr(code) for code in range(256)]
+
+Passable = Callable[[str], bool] | Collection[str] | bytes
+
+
+def not_wall(val: str) -> bool:
+    return val != "#"
+
+
+@lru_cache(maxsize=64)
+def _passable_codes(passable: Callable[[str], bool] | frozenset[str]) -> bytes:
+    """`passable` (a predicate on cell values or the passable values) as a table indexed by cell byte."""
+    if callable(passable):
+        allowed = [bool(passable(_CHARS[code])) for code in range(256)]
+    else:
+        allowed = [_CHARS[code] in passable for code in range(256)]
+    allowed[EMPTY] = False
+    return bytes(allowed)
+
+
+def passable_table(passable: Passable) -> bytes:
+    """
+    `passable` as the 256-byte table, indexed by cell byte, that neighbors(), adjacency() and bfs() use; they
+    also accept the table itself, which skips even the cached lookup. Tables are cached by the predicate object,
+    so pass the same function every time: a lambda written at the call site is a new object on each call, which
+    rebuilds its table and pushes the others out of the cache. Build its table once with this function instead.
+    """
+    if isinstance(passable, bytes):
+        if len(passable) != 256:
+            raise ValueError(f"a passable table has 256 entries, not {len(passable)}")
+        return passable
+    return _passable_codes(passable if callable(passable) else frozenset(passable))
 
 
 class Grid:
-    def __init__(self):
-        self.values = {}
-        self.width = 0
-        self.height = 0
+    """
+    A rectangular grid of single-character cells, stored densely: one byte per cell in a flat row-major bytearray,
+    so reading a cell is an index computation rather than hashing an (i, j) tuple.
+
+    Writing outside the current bounds grows the grid, but only towards positive indices; use SparseGrid for
+    grids with negative coordinates, cells holding anything other than one character, or mostly empty grids.
+    """
+
+    __slots__ = ("height", "width", "cells", "_adjacency")
+
+    def __init__(self, height: int = 0, width: int = 0, fill: str | None = None):
+        """`height` x `width` cells, all set to `fill`, or all unset if it is None."""
+        self.height = height
+        self.width = width
+        self.cells = bytearray([EMPTY if fill is None else ord(fill)]) * (height * width)
+        self._adjacency = {}  # (passable table, connectivity) -> (offsets, indices)
 
     @classmethod
     def from_puzzle_input(cls, puzzle_input: list[str]) -> "Grid":
-        g = Grid()
-        for i, row in enumerate(puzzle_input):
-            for j, val in enumerate(row):
-                g.set(i, j, val)
+        rows = [row.encode("latin-1") for row in puzzle_input]
+        while rows and not rows[-1]:
+            rows.pop()  # trailing blank lines hold no cells, so like setting cells one by one, they add no rows
+        g = cls(len(rows), max(map(len, rows), default=0))
+        g.cells = bytearray(b"".join(row.ljust(g.width, b"\0") for row in rows))
+        return g
+
+    @classmethod
+    def from_numpy(cls, array) -> "Grid":
+        """
+        A grid from a 2D array of character codes (as returned by to_numpy, 0 for unset cells) or of
+        single-character strings. The cells are copied.
+        """
+        array = np.asarray(array)
+        if array.ndim != 2:
+            raise ValueError(f"expected a 2D array, got {array.ndim} dimensions")
+        if array.dtype.kind == "U":
+            array = array.astype("U1").view(np.uint32)  # the code of each string's first character, 0 if empty
+        if array.size and not 0 <= array.min() <= array.max() <= 255:
+            raise ValueError("Grid cells hold character codes between 0 and 255")
+        g = cls(*array.shape)
+        g.cells = bytearray(np.ascontiguousarray(array, dtype=np.uint8).tobytes())
         return g
 
+    def to_numpy(self):
+        """
+        The grid as a height x width uint8 array of character codes, 0 for unset cells, e.g.
+        `grid.to_numpy() == ord("#")` for a mask of the walls.
+
+        The array is a view of the grid's own storage, not a copy: writing to it changes the grid, and set()
+        changes it, until the grid grows (growing moves the grid to a new buffer). Writes through the view
+        bypass set(), so call invalidate_adjacency() after changing walls that way.
+        """
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.width)
+
+    def count(self, val: str) -> int:
+        """Number of cells holding `val`."""
+        return self.cells.count(code) if (code := self._code(val)) != -1 else 0
+
+    def count_neighbors(self, val: str, stencil=EIGHT_NEIGHBORS):
+        """
+        For every cell, the number of cells around it holding `val`, as a height x width int array.
+
+        `stencil` is an odd-sized 2D array of weights centred on the cell: by default the 8 surrounding cells
+        (EIGHT_NEIGHBORS), FOUR_NEIGHBORS for the orthogonal ones only. Cells outside the grid count as empty.
+        """
+        stencil = np.asarray(stencil)
+        if stencil.ndim != 2 or stencil.shape[0] % 2 == 0 or stencil.shape[1] % 2 == 0:
+            raise ValueError(f"stencil must be a 2D array with odd sides, not of shape {stencil.shape}")
+        ci, cj = stencil.shape[0] // 2, stencil.shape[1] // 2
+        matches = np.pad(self.to_numpy() == self._code(val), ((ci, ci), (cj, cj)))
+        counts = np.zeros((self.height, self.width), dtype=np.result_type(stencil, np.intp))
+        # summing shifted copies of the whole mask, one per stencil entry, keeps the loop out of Python
+        for si, sj in zip(*np.nonzero(stencil)):
+            counts += stencil[si, sj] * matches[si:si + self.height, sj:sj + self.width]
+        return counts
+
+    def set_many(self, mask, val: str) -> None:
+        """Sets every cell where the height x width boolean array `mask` is True to `val`."""
+        if (code := self._code(val)) == -1:
+            raise TypeError(f"Grid cells hold a single character, not {val!r}; use SparseGrid instead")
+        self.to_numpy()[np.asarray(mask, dtype=bool)] = code
+        self._adjacency.clear()
+
+    @staticmethod
+    def _code(val: str) -> int:
+        """The byte a cell holding `val` stores, or -1 (matching nothing) if no cell can hold it."""
+        return ord(val) if isinstance(val, str) and len(val) == 1 and ord(val) <= 255 else -1
+
     def repeat(self, n_i: int, n_j: int) -> "Grid":
         """Returns a new Grid consisting of self, repeated n_i times vertically and n_j times horizontally."""
-        g = Grid()
-        for i in range(self.height * n_i):
-            for j in range(self.width * n_j):
-                g.set(i, j, self.at(i % self.height, j % self.width))
+        g = type(self)(self.height * n_i, self.width * n_j)
+        rows = [self.cells[i * self.width:(i + 1) * self.width] * n_j for i in range(self.height)]
+        g.cells = bytearray(b"".join(rows) * n_i)
         return g
 
+    @property
+    def values(self) -> dict[tuple[int, int], str]:
+        """A {(i, j): value} copy of the set cells; changing it does not change the grid."""
+        return {(i, j): self.at(i, j) for (i, j) in self}
+
     def at(self, i: int, j: int) -> str:
-        return self.values[(i, j)]
+        width = self.width
+        if 0 <= j < width and 0 <= i < self.height and (code := self.cells[i * width + j]):
+            return _CHARS[code]
+        raise KeyError((i, j))
 
     def in_bounds(self, i: int, j: int) -> bool:
-        return (i, j) in self.values
+        width = self.width
+        return 0 <= j < width and 0 <= i < self.height and self.cells[i * width + j] != EMPTY
 
-    def __iter__(self):
-        for (i, j) in sorted(self.values.keys()):
-            yield (i, j)
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        """The (i, j) of every set cell, in row-major order."""
+        if EMPTY not in self.cells:  # every cell is set, as in most puzzle grids
+            return product(range(self.height), range(self.width))
+        return map(divmod, self.iter_indices(), repeat(self.width))
 
-    def __repr__(self):
-        output = []
+    def iter_indices(self) -> Iterator[int]:
+        """
+        The flat row-major index k = i * width + j of every set cell, in order, for hot loops that work on
+        `cells` (or arrays shaped like it) directly and don't need (i, j) at all.
+        """
+        if EMPTY not in self.cells:
+            return iter(range(len(self.cells)))
+        return compress(count(), self.cells)
+
+    def iter_cells(self) -> Iterator[tuple[int, int, str]]:
+        """(i, j, value) for every set cell, in row-major order."""
+        width, cells = self.width, self.cells
         for i in range(self.height):
-            s = []
-            for j in range(self.width):
-                s.append(str(self.values[(i, j)]))
-            output.append("".join(s))
-        return "\n".join(output)
+            for j, code in enumerate(cells[i * width:(i + 1) * width]):
+                if code:
+                    yield i, j, _CHARS[code]
+
+    def __repr__(self):
+        text = self.cells.decode("latin-1").replace("\0", " ")
+        return "\n".join(text[i * self.width:(i + 1) * self.width] for i in range(self.height))
 
     def set(self, i: int, j: int, val: str) -> None:
-        self.values[(i, j)] = val
-        self.height = max(self.height, i + 1)
-        self.width = max(self.width, j + 1)
+        if not (0 <= i < self.height and 0 <= j < self.width):
+            self._grow(i, j)
+        if (code := self._code(val)) == -1:
+            raise TypeError(f"Grid cells hold a single character, not {val!r}; use SparseGrid instead")
+        k = i * self.width + j
+        if self._adjacency:
+            self._invalidate_adjacency(self.cells[k], code)
+        self.cells[k] = code
+
+    def _grow(self, i: int, j: int) -> None:
+        """Extends the grid so that (i, j) is inside it."""
+        if i < 0 or j < 0:
+            raise IndexError(f"Grid can't grow to negative coordinates {(i, j)}; use SparseGrid instead")
+        height, width = max(self.height, i + 1), max(self.width, j + 1)
+        if width != self.width:
+            padding = bytes(width - self.width)
+            self.cells = bytearray(b"".join(
+                self.cells[r * self.width:(r + 1) * self.width] + padding for r in range(self.height)
+            ))
+        # a new buffer rather than extend(), which fails while to_numpy() views of the old one exist
+        self.cells = self.cells + bytes((height - self.height) * width)
+        self.height, self.width = height, width
+        self._adjacency.clear()
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, Grid):
             return False
+        if type(self) is type(other) is Grid:
+            return self.width == other.width and self.height == other.height and self.cells == other.cells
         return ((self.width == other.width) and (self.height == other.height) and
                 (self.values == other.values))
 
-    def where(self, val: str) -> list[tuple[int, int]]:
-        return [(i, j) for (i, j), v in self.values.items() if v == val]
+    def where(self, val: str | None = None, *, mask=None) -> list[tuple[int, int]]:
+        """
+        The (i, j) of the cells holding `val`, in row-major order. With a height x width boolean array `mask`,
+        only cells where it is True; with a mask and no `val`, every cell where it is True.
+        """
+        if mask is not None:
+            selected = np.asarray(mask, dtype=bool)
+            if val is not None:
+                selected = selected & (self.to_numpy() == self._code(val))
+            return list(zip(*(indices.tolist() for indices in np.nonzero(selected))))
+        if (code := self._code(val)) == -1:
+            return []
+        width, cells = self.width, self.cells
+        points = []
+        k = cells.find(code)
+        while k != -1:
+            points.append(divmod(k, width))
+            k = cells.find(code, k + 1)
+        return points
 
-    def neighbors(self, point: tuple[int, int], *, allow_wrap_around: bool = False) -> Iterable[tuple[int, int]]:
+    def neighbors(
+            self,
+            point: tuple[int, int],
+            *,
+            allow_wrap_around: bool = False,
+            passable: Passable = not_wall,
+            connectivity: int = 4,
+    ) -> Iterable[tuple[int, int]]:
         """
+        The neighbors of `point` whose value `passable` accepts (a predicate, a collection of values or a
+        passable_table(); by default everything but "#"): the 4 orthogonal ones, or all 8 with `connectivity=8`.
+        Reuse the same predicate object across calls (see passable_table()).
+
         allow_wrap_around: If True, wraps the point's coordinates around as if the grid extends to infinity.
+
+        Uses the adjacency table for `passable` and `connectivity` if one has been built (see adjacency()).
         """
         (i, j) = point
-        for (di, dj) in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+        height, width, cells = self.height, self.width, self.cells
+        can_enter = passable_table(passable)
+        key = (can_enter, connectivity)
+        if not allow_wrap_around and key in self._adjacency and 0 <= i < height and 0 <= j < width:
+            offsets, indices = self._adjacency[key]
+            k = i * width + j
+            for n in indices[offsets[k]:offsets[k + 1]]:
+                yield divmod(n, width)
+            return
+
+        if allow_wrap_around:
+            i, j = i % height, j % width  # neighbors of the wrapped point, shifted back to where `point` is
+            shift_i, shift_j = point[0] - i, point[1] - j
+        for (di, dj) in DIRECTIONS[connectivity]:
             (ni, nj) = (i + di, j + dj)
 
             if allow_wrap_around:
-                (wrapped_ni, wrapped_nj) = (ni % self.height, nj % self.width)
-                if self.in_bounds(wrapped_ni, wrapped_nj) and self.at(wrapped_ni, wrapped_nj) != "#":
-                    yield (ni, nj)
+                (wrapped_ni, wrapped_nj) = (ni % height, nj % width)
+                if can_enter[cells[wrapped_ni * width + wrapped_nj]]:
+                    yield (ni + shift_i, nj + shift_j)
 
             else:
-                if self.in_bounds(ni, nj) and self.at(ni, nj) != "#":
+                if 0 <= ni < height and 0 <= nj < width and can_enter[cells[ni * width + nj]]:
                     yield (ni, nj)
 
+    def adjacency(self, passable: Passable = not_wall, connectivity: int = 4) -> tuple[list[int], list[int]]:
+        """
+        Precomputed neighbors of every cell, CSR-style over flat row-major indices: the passable neighbors of
+        cell k = i * width + j are indices[offsets[k]:offsets[k + 1]].
+
+        Built once per (passable, connectivity) with numpy and kept until set() changes whether some cell is
+        passable for it, so searches on a static grid pay for the bounds and wall checks only once.
+        """
+        key = (passable_table(passable), connectivity)
+        if key not in self._adjacency:
+            self._adjacency[key] = self._build_adjacency(*key)
+        return self._adjacency[key]
+
+    def _build_adjacency(self, can_enter: bytes, connectivity: int) -> tuple[list[int], list[int]]:
+        if connectivity not in DIRECTIONS:
+            raise ValueError(f"connectivity must be 4 or 8, not {connectivity}")
+        height, width = self.height, self.width
+        # whether each cell can be entered, in a frame of cells that can't so that shifted slices stay in bounds
+        enterable = np.pad(np.frombuffer(can_enter, dtype=bool)[self.to_numpy()], 1)
+        flat = np.arange(height * width).reshape(height, width)
+        valid, targets = [], []
+        for di, dj in DIRECTIONS[connectivity]:
+            valid.append(enterable[1 + di:1 + di + height, 1 + dj:1 + dj + width])
+            targets.append(flat + (di * width + dj))
+        valid = np.stack(valid, axis=-1).reshape(height * width, -1)
+        targets = np.stack(targets, axis=-1).reshape(height * width, -1)
+        offsets = np.concatenate(([0], np.cumsum(valid.sum(axis=1))))
+        return offsets.tolist(), targets[valid].tolist()
+
+    def _invalidate_adjacency(self, old_code: int, new_code: int) -> None:
+        """Drops the adjacency tables for which a cell going from `old_code` to `new_code` changes passability."""
+        for can_enter, connectivity in list(self._adjacency):
+            if can_enter[old_code] != can_enter[new_code]:
+                del self._adjacency[(can_enter, connectivity)]
+
+    def invalidate_adjacency(self) -> None:
+        """Drops every adjacency table, e.g. after changing cells through a to_numpy() view."""
+        self._adjacency.clear()
+
+    def bfs(
+            self,
+            sources: tuple[int, int] | Iterable[tuple[int, int]],
+            *,
+            target: tuple[int, int] | None = None,
+            max_dist: int | None = None,
+            passable: Passable = not_wall,
+            connectivity: int = 4,
+    ):
+        """
+        Breadth-first search from one (i, j) or from several sources at once (each cell then gets its distance to
+        the nearest source, in a single pass), over the neighbors given by `passable` and `connectivity` as in
+        neighbors(). Sources are always included.
+
+        Returns a height x width int array of distances, -1 for cells not reached. The search stops once
+        `target` is reached or the distances exceed `max_dist`, leaving the cells beyond them at -1.
+        Raises IndexError if a source or the target is not a cell of the grid.
+
+        8-connected searches, and 4-connected ones once adjacency() has been called for `passable`, walk the
+        adjacency table; otherwise the 4 neighbors are checked inline, which is cheaper than building a table
+        that a set() between searches would throw away.
+        """
+        height, width, cells = self.height, self.width, self.cells
+        can_enter = passable_table(passable)
+        if isinstance(sources, tuple) and sources and isinstance(sources[0], int):
+            sources = [sources]
+        dist = [-1] * (height * width)
+        frontier = deque()
+        for i, j in sources:
+            if not self.in_bounds(i, j):
+                raise IndexError(f"bfs source {(i, j)} is not a cell of the grid")
+            if dist[k := i * width + j] == -1:
+                dist[k] = 0
+                frontier.append(k)
+        if target is not None and not self.in_bounds(*target):
+            raise IndexError(f"bfs target {target} is not a cell of the grid")
+        goal = -1 if target is None else target[0] * width + target[1]
+
+        if connectivity != 4 or (can_enter, connectivity) in self._adjacency:
+            offsets, indices = self.adjacency(can_enter, connectivity)
+            while frontier:
+                k = frontier.popleft()
+                if k == goal:
+                    break
+                d = dist[k] + 1
+                if max_dist is not None and d > max_dist:
+                    break
+                for n in indices[offsets[k]:offsets[k + 1]]:
+                    if dist[n] == -1:
+                        dist[n] = d
+                        frontier.append(n)
+            return np.array(dist, dtype=np.int64).reshape(height, width)
+
+        last_row = (height - 1) * width
+        # flat indices and a check per direction keep the loop free of tuples and bounds helpers
+        while frontier:
+            k = frontier.popleft()
+            if k == goal:
+                break
+            d = dist[k] + 1
+            if max_dist is not None and d > max_dist:
+                break
+            if k >= width and dist[n := k - width] == -1 and can_enter[cells[n]]:
+                dist[n] = d
+                frontier.append(n)
+            if k < last_row and dist[n := k + width] == -1 and can_enter[cells[n]]:
+                dist[n] = d
+                frontier.append(n)
+            j = k % width
+            if j > 0 and dist[n := k - 1] == -1 and can_enter[cells[n]]:
+                dist[n] = d
+                frontier.append(n)
+            if j < width - 1 and dist[n := k + 1] == -1 and can_enter[cells[n]]:
+                dist[n] = d
+                frontier.append(n)
+        return np.array(dist, dtype=np.int64).reshape(height, width)
+
     def dijkstra(
             self,
             start: tuple[int, int],
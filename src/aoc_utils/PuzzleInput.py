@@ -0,0 +1,145 @@
+import mmap
+import os
+from array import array
+from collections.abc import Iterator, Sequence
+from itertools import accumulate, count
+from operator import add
+from typing import Union
+
+CHUNK_SIZE = 1 << 20  # bytes scanned at a time while indexing lines
+ITER_BATCH = 1024  # lines decoded at a time while iterating
+
+
+class PuzzleInput(Sequence):
+    """
+    A read-only, lazily decoded sequence of the lines in a puzzle input file.
+
+    The file is memory-mapped rather than read, and each line is only decoded to a str when it is accessed,
+    so it behaves like the list returned by `read_text().splitlines()` without holding every line in memory.
+    """
+
+    def __init__(
+            self,
+            buffer: Union[bytes, mmap.mmap],
+            starts: array,
+            lo: int = 0,
+            hi: Union[int, None] = None,
+    ):
+        """
+        `starts` holds the offset of every line in `buffer`; [lo, hi) selects the lines this object covers.
+        """
+        self._buffer = buffer
+        self._starts = starts
+        self._lo = lo
+        self._hi = len(starts) if hi is None else hi
+        self._last_end = len(buffer) - 1 if buffer[-1:] == b"\n" else len(buffer)
+
+    @classmethod
+    def from_file(cls, filepath: Union[str, os.PathLike]) -> "PuzzleInput":
+        """
+        Memory-maps the file at `filepath` and indexes its line boundaries.
+        """
+        with open(filepath, "rb") as f:
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files can't be mapped
+                buffer = b""
+        return cls(buffer, cls._line_starts(buffer))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PuzzleInput":
+        """
+        Wraps an in-memory buffer, e.g. an input that didn't come from a file.
+        """
+        return cls(data, cls._line_starts(data))
+
+    @staticmethod
+    def _line_starts(buffer: Union[bytes, mmap.mmap]) -> array:
+        """
+        Returns the offset of each line, splitting on "\n" like splitlines() (no empty line after a final "\n").
+        Works through the buffer in chunks so only one chunk is ever copied at a time.
+        """
+        starts = array("q")
+        pos, size = 0, len(buffer)
+        while pos < size:
+            chunk_end = buffer.rfind(b"\n", pos, pos + CHUNK_SIZE) + 1
+            if chunk_end <= pos or pos + CHUNK_SIZE >= size:
+                chunk_end = size
+            segments = buffer[pos:chunk_end].split(b"\n")
+            if segments[-1] == b"":
+                segments.pop()  # the chunk ended with a newline, not an empty line
+            # line k starts after the k previous lines and their k newlines
+            starts.extend(map(add, accumulate(map(len, segments[:-1]), initial=0), count(pos)))
+            pos = chunk_end
+        return starts
+
+    def _decode_lines(self, lo: int, hi: int) -> list[str]:
+        """
+        Decodes lines [lo, hi) in one pass.
+        """
+        end = self._starts[hi] - 1 if hi < len(self._starts) else self._last_end
+        text = self._buffer[self._starts[lo]:end].decode()
+        lines = text.split("\n")
+        if "\r" in text:
+            lines = [line.removesuffix("\r") for line in lines]
+        return lines
+
+    @property
+    def raw(self) -> memoryview:
+        """
+        A zero-copy view of the underlying bytes covered by these lines, for parsing directly from the buffer.
+        """
+        if self._lo == self._hi:
+            return memoryview(b"")
+        end = self._starts[self._hi] - 1 if self._hi < len(self._starts) else self._last_end
+        return memoryview(self._buffer)[self._starts[self._lo]:end]
+
+    def line_bytes(self, index: int) -> bytes:
+        """
+        Returns the line at `index` as bytes, without decoding it.
+        """
+        i = self._line_index(index)
+        end = self._starts[i + 1] - 1 if i + 1 < len(self._starts) else self._last_end
+        return self._buffer[self._starts[i]:end].removesuffix(b"\r")
+
+    def _line_index(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PuzzleInput index out of range")
+        return self._lo + index
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, "PuzzleInput", list[str]]:
+        """
+        Integer indices decode a single line. Contiguous slices return a PuzzleInput sharing the same buffer;
+        slices with a step return a list of str.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return PuzzleInput(self._buffer, self._starts, self._lo + start, self._lo + max(start, stop))
+        return self.line_bytes(index).decode()
+
+    def __iter__(self) -> Iterator[str]:
+        for lo in range(self._lo, self._hi, ITER_BATCH):
+            yield from self._decode_lines(lo, min(lo + ITER_BATCH, self._hi))
+
+    def __add__(self, other: Sequence) -> list[str]:
+        return list(self) + list(other)
+
+    def __radd__(self, other: Sequence) -> list[str]:
+        return list(other) + list(self)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return False
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        if len(self) > 10:
+            return f"<PuzzleInput object with {len(self)} lines, {len(self.raw)} bytes>"
+        return f"PuzzleInput({list(self)!r})"
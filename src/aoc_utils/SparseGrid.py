@@ -0,0 +1,180 @@
+from collections import deque
+from typing import Iterable, Iterator
+
+from .Grid import DIRECTIONS, Grid, Passable, not_wall, np, passable_table
+
+
+class SparseGrid(Grid):
+    """
+    A Grid that stores its cells in a dict keyed by (i, j): slower than Grid's flat array, but coordinates may be
+    negative, cells may hold any value, and mostly empty grids only pay for the cells that are set.
+    """
+
+    values: dict = None  # a plain attribute here, shadowing Grid's read-only copy
+
+    def __init__(self):
+        self.values = {}
+        self.width = 0
+        self.height = 0
+        self._order = []  # the keys of `values` in row-major order, re-sorted only after new cells are added
+
+    @classmethod
+    def from_puzzle_input(cls, puzzle_input: list[str]) -> "SparseGrid":
+        g = cls()
+        for i, row in enumerate(puzzle_input):
+            for j, val in enumerate(row):
+                g.set(i, j, val)
+        return g
+
+    @classmethod
+    def from_numpy(cls, array) -> "SparseGrid":
+        """A grid with a cell for every nonzero entry of a 2D array of character codes or of strings."""
+        array = np.asarray(array)
+        if array.ndim != 2:
+            raise ValueError(f"expected a 2D array, got {array.ndim} dimensions")
+        g = cls()
+        g.height, g.width = array.shape
+        for (i, j), val in np.ndenumerate(array):
+            if val:
+                g.set(i, j, val.item() if array.dtype.kind == "U" else chr(val))
+        return g
+
+    def to_numpy(self):
+        """
+        The cells from (0, 0) to (height - 1, width - 1) as a uint8 array of character codes, 0 for unset cells;
+        cells at negative coordinates are left out. This is a copy.
+        """
+        array = np.zeros((self.height, self.width), dtype=np.uint8)
+        for (i, j), val in self.values.items():
+            if i >= 0 and j >= 0:
+                array[i, j] = ord(val)
+        return array
+
+    def count(self, val) -> int:
+        return sum(v == val for v in self.values.values())
+
+    def set_many(self, mask, val) -> None:
+        for i, j in zip(*(indices.tolist() for indices in np.nonzero(mask))):
+            self.set(i, j, val)
+
+    def repeat(self, n_i: int, n_j: int) -> "SparseGrid":
+        """Returns a new SparseGrid consisting of self, repeated n_i times vertically and n_j times horizontally."""
+        g = type(self)()
+        for i in range(self.height * n_i):
+            for j in range(self.width * n_j):
+                g.set(i, j, self.at(i % self.height, j % self.width))
+        return g
+
+    def at(self, i: int, j: int):
+        return self.values[(i, j)]
+
+    def in_bounds(self, i: int, j: int) -> bool:
+        return (i, j) in self.values
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        # cells are never removed, so the order only goes stale when the number of cells changes
+        if len(self._order) != len(self.values):
+            self._order = sorted(self.values)
+        return iter(self._order)
+
+    def iter_indices(self) -> Iterator[int]:
+        """Grid.iter_indices; only meaningful while no coordinate is negative."""
+        width = self.width
+        return (i * width + j for (i, j) in self)
+
+    def iter_cells(self) -> Iterator[tuple]:
+        values = self.values
+        return ((i, j, values[(i, j)]) for (i, j) in self)
+
+    def __repr__(self):
+        output = []
+        for i in range(self.height):
+            s = []
+            for j in range(self.width):
+                s.append(str(self.values[(i, j)]))
+            output.append("".join(s))
+        return "\n".join(output)
+
+    def set(self, i: int, j: int, val) -> None:
+        self.values[(i, j)] = val
+        self.height = max(self.height, i + 1)
+        self.width = max(self.width, j + 1)
+
+    # Grid's flat buffer and adjacency cache don't exist here, so the parts of Grid built on them are replaced
+    @property
+    def cells(self):
+        raise AttributeError("SparseGrid keeps its cells in the `values` dict, not in a flat `cells` buffer")
+
+    def _grow(self, i: int, j: int) -> None:
+        raise NotImplementedError("SparseGrid has no buffer to grow; set() adds cells anywhere")
+
+    def _invalidate_adjacency(self, old_code: int, new_code: int) -> None:
+        pass  # adjacency() builds a new table on every call, so there is nothing to drop
+
+    def invalidate_adjacency(self) -> None:
+        """Does nothing: SparseGrid doesn't keep adjacency tables (see adjacency())."""
+
+    def where(self, val=None, *, mask=None) -> list[tuple[int, int]]:
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+            points = zip(*(indices.tolist() for indices in np.nonzero(mask)))
+            return [p for p in points if val is None or self.values.get(p) == val]
+        return [(i, j) for (i, j), v in self.values.items() if v == val]
+
+    def neighbors(
+            self,
+            point: tuple[int, int],
+            *,
+            allow_wrap_around: bool = False,
+            passable: Passable = not_wall,
+            connectivity: int = 4,
+    ) -> Iterable[tuple[int, int]]:
+        if isinstance(passable, bytes):
+            table = passable_table(passable)
+
+            def can_enter(val) -> bool:
+                return isinstance(val, str) and len(val) == 1 and ord(val) < 256 and bool(table[ord(val)])
+        else:
+            can_enter = passable if callable(passable) else passable.__contains__
+        (i, j) = point
+        for (di, dj) in DIRECTIONS[connectivity]:
+            (ni, nj) = (i + di, j + dj)
+            wrapped = (ni % self.height, nj % self.width) if allow_wrap_around else (ni, nj)
+            if wrapped in self.values and can_enter(self.values[wrapped]):
+                yield (ni, nj)
+
+    def adjacency(self, passable: Passable = not_wall, connectivity: int = 4) -> tuple[list[int], list[int]]:
+        """Grid.adjacency over the cells from (0, 0) to (height - 1, width - 1), rebuilt on every call."""
+        return self._build_adjacency(passable_table(passable), connectivity)
+
+    def bfs(
+            self,
+            sources: tuple[int, int] | Iterable[tuple[int, int]],
+            *,
+            target: tuple[int, int] | None = None,
+            max_dist: int | None = None,
+            passable: Passable = not_wall,
+            connectivity: int = 4,
+    ) -> dict[tuple[int, int], int]:
+        """Grid.bfs, returning a {(i, j): distance} dict of the cells reached."""
+        if isinstance(sources, tuple) and sources and isinstance(sources[0], int):
+            sources = [sources]
+        dists = dict.fromkeys(sources, 0)
+        for point in dists:
+            if point not in self.values:
+                raise IndexError(f"bfs source {point} is not a cell of the grid")
+        if target is not None and target not in self.values:
+            raise IndexError(f"bfs target {target} is not a cell of the grid")
+        frontier = deque(dists)
+        while frontier:
+            curr = frontier.popleft()
+            if curr == target:
+                break
+            d = dists[curr] + 1
+            if max_dist is not None and d > max_dist:
+                break
+            for n in self.neighbors(curr, passable=passable, connectivity=connectivity):
+                if n not in dists:
+                    dists[n] = d
+                    frontier.append(n)
+        return dists
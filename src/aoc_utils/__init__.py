@@ -1,9 +1,15 @@
+from . import instrumentation
 from .DirectedGraph import DirectedGraph
 from .DirectedWeightedGraph import DirectedWeightedGraph
 from .Grid import Grid
 from .IntRangeMap import IntRangeMap
 from .IntRangeSet import IntRangeSet
+from .lazy_import import lazy_import
+from .memo import clear_memos, memo_scope, memo_stats, memoize
+from .parallel import map_reduce
+from .PuzzleInput import PuzzleInput
 from .Shape import Shape
+from .SparseGrid import SparseGrid
 
 __all__ = [
     "DirectedGraph",
@@ -11,5 +17,14 @@ __all__ = [
     "Grid",
     "IntRangeSet",
     "IntRangeMap",
+    "PuzzleInput",
     "Shape",
+    "SparseGrid",
+    "lazy_import",
+    "memoize",
+    "memo_scope",
+    "memo_stats",
+    "clear_memos",
+    "map_reduce",
+    "instrumentation",
 ]
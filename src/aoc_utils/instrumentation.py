@@ -0,0 +1,184 @@
+import heapq
+import importlib
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator
+
+counters: Counter = Counter()
+
+_originals: list[tuple[object, str, object]] = []
+
+
+class _CountingHeapq:
+    """Stands in for the heapq module inside instrumented aoc_utils modules."""
+
+    def __getattr__(self, name: str):
+        return getattr(heapq, name)
+
+    @staticmethod
+    def heappush(heap: list, item) -> None:
+        counters["heap pushes"] += 1
+        heapq.heappush(heap, item)
+
+    @staticmethod
+    def heappop(heap: list):
+        counters["heap pops"] += 1
+        return heapq.heappop(heap)
+
+
+def _counting_calls(name: str) -> Callable[[Callable], Callable]:
+    def decorate(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            counters[name] += 1
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _counting_yields(name: str) -> Callable[[Callable], Callable]:
+    def decorate(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            for item in fn(*args, **kwargs):
+                counters[name] += 1
+                yield item
+        return wrapper
+    return decorate
+
+
+def _counting_settled(fn: Callable) -> Callable:
+    """Every node in a dijkstra result was popped and expanded exactly once."""
+    @wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        dists = fn(self, *args, **kwargs)
+        counters["nodes settled"] += len(dists)
+        return dists
+    return wrapper
+
+
+def _counting_reached(fn: Callable) -> Callable:
+    """Every cell a bfs reached was expanded at most once; dense grids return -1 for the others."""
+    @wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        dists = fn(self, *args, **kwargs)
+        counters["nodes settled"] += len(dists) if isinstance(dists, dict) else int((dists >= 0).sum())
+        return dists
+    return wrapper
+
+
+def _counting_graph_expansions(adjacency: Callable) -> Callable[[Callable], Callable]:
+    """For graphs whose dijkstra iterates a plain adjacency set per settled node."""
+    def decorate(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            dists = fn(self, *args, **kwargs)
+            counters["neighbor expansions"] += sum(len(adjacency(self).get(node, ())) for node in dists)
+            return dists
+        return wrapper
+    return decorate
+
+
+def _counting_scans(size: Callable) -> Callable[[Callable], Callable]:
+    """For bulk grid operations, which look at every cell of the grid (`size` of them) in one call."""
+    def decorate(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            counters["grid cells scanned"] += size(self)
+            return fn(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _counting_masked_writes(np) -> Callable[[Callable], Callable]:
+    """Grid.set_many writes every cell its mask selects, without going through set()."""
+    def decorate(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(self, mask, *args, **kwargs):
+            counters["grid writes"] += np.count_nonzero(mask)
+            return fn(self, mask, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _counting_merges(fn: Callable) -> Callable:
+    @wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        before = len(self.ranges)
+        fn(self, *args, **kwargs)
+        counters["ranges merged"] += before + 1 - len(self.ranges)
+    return wrapper
+
+
+def _patches() -> list[tuple[object, str, Callable]]:
+    """(owner, attribute, wrap) for everything that gets counted."""
+    grid = importlib.import_module("aoc_utils.Grid")
+    sparse_grid = importlib.import_module("aoc_utils.SparseGrid")
+    directed = importlib.import_module("aoc_utils.DirectedGraph")
+    weighted = importlib.import_module("aoc_utils.DirectedWeightedGraph")
+    range_set = importlib.import_module("aoc_utils.IntRangeSet")
+    return [
+        *((module, "heapq", lambda _: _CountingHeapq()) for module in (grid, directed, weighted)),
+        (grid.Grid, "at", _counting_calls("grid reads")),
+        (grid.Grid, "set", _counting_calls("grid writes")),
+        (sparse_grid.SparseGrid, "at", _counting_calls("grid reads")),
+        (sparse_grid.SparseGrid, "set", _counting_calls("grid writes")),
+        (grid.Grid, "set_many", _counting_masked_writes(grid.np)),  # SparseGrid.set_many calls set()
+        (grid.Grid, "to_numpy", _counting_calls("grid numpy views")),
+        *((grid.Grid, name, _counting_scans(lambda g: g.height * g.width))
+          for name in ("count", "count_neighbors", "where")),
+        *((sparse_grid.SparseGrid, name, _counting_scans(lambda g: len(g.values))) for name in ("count", "where")),
+        (grid.Grid, "neighbors", _counting_yields("neighbor expansions")),
+        (sparse_grid.SparseGrid, "neighbors", _counting_yields("neighbor expansions")),
+        (grid.Grid, "dijkstra", _counting_settled),
+        (grid.Grid, "bfs", _counting_reached),
+        (sparse_grid.SparseGrid, "bfs", _counting_reached),
+        (directed.DirectedGraph, "dijkstra", _counting_settled),
+        (directed.DirectedGraph, "dijkstra", _counting_graph_expansions(lambda g: g.graph)),
+        (weighted.DirectedWeightedGraph, "dijkstra", _counting_settled),
+        (weighted.DirectedWeightedGraph, "dijkstra", _counting_graph_expansions(lambda g: g.neighbors)),
+        (range_set.IntRangeSet, "add_range", _counting_merges),
+    ]
+
+
+def enable() -> None:
+    """
+    Swaps counting wrappers into the aoc_utils hot paths. Nothing is counted, and nothing is slowed down,
+    until this is called; disable() puts the original functions back.
+    """
+    if _originals:
+        return
+    for owner, name, wrap in _patches():
+        original = vars(owner)[name]
+        if not any(o is owner and n == name for o, n, _ in _originals):
+            _originals.append((owner, name, original))
+        setattr(owner, name, wrap(getattr(owner, name)))
+
+
+def disable() -> None:
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
+
+
+@contextmanager
+def counting() -> Iterator[Counter]:
+    """
+    Enables instrumentation for the duration of the block and yields the counts it made.
+
+        with counting() as counts:
+            grid.dijkstra(start)
+        print(counts["nodes settled"])
+    """
+    was_enabled = bool(_originals)
+    counters.clear()
+    enable()
+    counts = Counter()
+    try:
+        yield counts
+    finally:
+        counts.update(counters)
+        counters.clear()
+        if not was_enabled:
+            disable()
@@ -0,0 +1,23 @@
+import importlib
+import sys
+from types import ModuleType
+
+
+class _LazyModule(ModuleType):
+    """A stand-in for a module that imports it the first time one of its attributes is read."""
+
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)  # later reads of these attributes don't come through here again
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Returns the module `name` without importing it, or even looking it up; it is actually imported the first time
+    one of its attributes is accessed, and a missing module only raises ModuleNotFoundError then. Keeps heavy
+    dependencies (numpy, scipy, networkx, ...) off the startup path of days that don't use them on every run.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return _LazyModule(name)
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from typing import Callable, Iterator
+from weakref import WeakSet
+
+DEFAULT_MAX_ENTRIES = 1 << 20
+
+_memoized: WeakSet = WeakSet()
+
+
+def memoize(fn: Callable | None = None, *, max_entries: int | None = DEFAULT_MAX_ENTRIES, key: Callable | None = None):
+    """
+    Caches a function's results, evicting the least recently used entry beyond `max_entries` (None for no limit).
+
+    Unlike a mutable default argument or a module-level lru_cache, every memoized function is cleared together
+    by clear_memos() / memo_scope(), which the runner uses around each part.
+
+    By default the key is every argument, so they must all be hashable, and the cache is functools.lru_cache.
+    A custom `key` can make unhashable arguments hashable, but it must still tell apart every call whose result
+    differs: the cache outlives a single input whenever nothing clears it, e.g. outside the runner.
+
+        @memoize(key=lambda lights, buttons: (lights, tuple(sorted(buttons))))
+        def fewest_presses(lights, buttons): ...
+
+    The wrapper has cache_info() (as a dict) and cache_clear().
+    """
+    if fn is None:
+        return lambda f: memoize(f, max_entries=max_entries, key=key)
+
+    if key is None:
+        # functools' C implementation is several times faster than any Python-level wrapper
+        wrapper = lru_cache(maxsize=max_entries)(fn)
+        lru_cache_info = wrapper.cache_info
+
+        def cache_info() -> dict:
+            info = lru_cache_info()
+            return {"hits": info.hits, "misses": info.misses, "size": info.currsize,
+                    "evictions": info.misses - info.currsize, "max_entries": max_entries}
+
+        wrapper.cache_info = cache_info
+        _memoized.add(wrapper)
+        return wrapper
+
+    cache = OrderedDict()
+    hits = misses = evictions = 0
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        nonlocal hits, misses, evictions
+        k = key(*args, **kwargs)
+        try:
+            value = cache[k]
+        except KeyError:
+            misses += 1
+            value = cache[k] = fn(*args, **kwargs)
+            if max_entries is not None and len(cache) > max_entries:
+                cache.popitem(last=False)
+                evictions += 1
+            return value
+        hits += 1
+        cache.move_to_end(k)
+        return value
+
+    def cache_info() -> dict:
+        return {"hits": hits, "misses": misses, "size": len(cache), "evictions": evictions,
+                "max_entries": max_entries}
+
+    def cache_clear() -> None:
+        nonlocal hits, misses, evictions
+        cache.clear()
+        hits = misses = evictions = 0
+
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
+    _memoized.add(wrapper)
+    return wrapper
+
+
+def clear_memos() -> None:
+    """Empties every memoized function's cache and resets its statistics."""
+    for wrapper in list(_memoized):
+        wrapper.cache_clear()
+
+
+def memo_stats() -> dict[str, dict]:
+    """cache_info() of every memoized function that has been called since it was last cleared."""
+    return {wrapper.__qualname__: info for wrapper in list(_memoized)
+            if (info := wrapper.cache_info())["hits"] or info["misses"]}
+
+
+@contextmanager
+def memo_scope() -> Iterator[dict[str, dict]]:
+    """
+    Clears every memoized function on entry and on exit. On exit the yielded dict is filled with the
+    memo_stats() of the functions used inside the block.
+    """
+    clear_memos()
+    stats = {}
+    try:
+        yield stats
+    finally:
+        stats.update(memo_stats())
+        clear_memos()
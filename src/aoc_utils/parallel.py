@@ -0,0 +1,90 @@
+import math
+import os
+import time
+from functools import reduce
+from typing import Any, Callable, Iterable
+
+PROBE_SECONDS = 0.02  # records are first run serially for this long to estimate how long the rest would take
+MIN_PARALLEL_SECONDS = 0.25  # below this estimate, starting worker processes costs more than it saves
+CHUNKS_PER_WORKER = 4  # more chunks than workers so uneven records still balance out
+
+_NO_INITIAL = object()
+
+
+def max_workers() -> int:
+    """
+    Worker processes map_reduce may use: $AOC_MAX_WORKERS if set (the runner sets it to 1 when it already runs
+    several parts at once, and in its --timeout workers), otherwise every CPU.
+    """
+    if (value := os.environ.get("AOC_MAX_WORKERS")) is not None:
+        return max(1, int(value))
+    return os.cpu_count() or 1
+
+
+def _map_chunk(fn: Callable, chunk: list) -> list:
+    return [fn(record) for record in chunk]
+
+
+def _map_parallel(records: list, fn: Callable, workers: int, chunk_size: int | None) -> list | None:
+    """
+    [fn(record) for record in records] on a fork-based process pool, or None where fork isn't available or this
+    is a daemonic process (which may not have children), such as a `run.py --timeout` worker.
+    """
+    # imported here, so that importing aoc_utils doesn't pay for multiprocessing and concurrent.futures
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if "fork" not in multiprocessing.get_all_start_methods() or multiprocessing.current_process().daemon:
+        return None
+    chunk_size = chunk_size or math.ceil(len(records) / (workers * CHUNKS_PER_WORKER))
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    # fork, so workers inherit the solution modules the runner loaded under names spawn couldn't import
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork")) as executor:
+        return [result for chunk in executor.map(_map_chunk, [fn] * len(chunks), chunks) for result in chunk]
+
+
+def map_reduce(
+        records: Iterable,
+        fn: Callable[[Any], Any],
+        reducer: Callable[[Any, Any], Any],
+        initial: Any = _NO_INITIAL,
+        *,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        parallel: bool | None = None,
+) -> Any:
+    """
+    Returns reduce(reducer, map(fn, records)[, initial]), computing fn(record) on a process pool when that pays off.
+
+    By default the first records run serially in this process for about `PROBE_SECONDS`, and the rest only go to
+    a pool if they would take at least `MIN_PARALLEL_SECONDS` more, so cheap records never pay for starting
+    workers. Pass `parallel=True` when every record is known to be expensive, to skip the probe, or
+    `parallel=False` to always run serially. A single worker, platforms without fork and daemonic processes also
+    run serially.
+
+    Records are sent to workers in chunks (by default about 4 per worker) and the results are reduced in the
+    parent in record order, so the answer is exactly the serial one, whatever the reducer and worker count.
+
+    `fn` is pickled, so it must be a module-level function (or a functools.partial of one), and it must not rely
+    on state it changes:
+    each worker has its own copy of the process, so memo caches and instrumentation counters stay there.
+
+        total = map_reduce(equations, calibration_value, operator.add, 0)
+    """
+    records = list(records)
+    workers = min(workers or max_workers(), len(records))
+    results = []
+    if parallel is None and workers > 1:
+        t0 = time.perf_counter()
+        results.append(fn(records[0]))  # more than one worker means there are at least two records
+        while len(results) < len(records) and time.perf_counter() - t0 < PROBE_SECONDS:
+            results.append(fn(records[len(results)]))
+        remaining_seconds = (time.perf_counter() - t0) / len(results) * (len(records) - len(results))
+        parallel = remaining_seconds >= MIN_PARALLEL_SECONDS
+    remaining = records[len(results):]
+    workers = min(workers, len(remaining))
+    parallel_results = _map_parallel(remaining, fn, workers, chunk_size) if parallel and workers > 1 else None
+    results += map(fn, remaining) if parallel_results is None else parallel_results
+    if initial is _NO_INITIAL:
+        return reduce(reducer, results)
+    return reduce(reducer, results, initial)
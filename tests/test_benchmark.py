@@ -0,0 +1,60 @@
+from runner.benchmark import compare_to_baseline, interleaved_timings, load_baseline, save_baseline
+
+
+def double(n: int) -> int:
+    return 2 * n
+
+
+def fail(n: int) -> int:
+    raise ValueError(f"bad input {n}")
+
+
+def fail_after(calls: int):
+    """A function that works for its first `calls` calls, then raises."""
+    count = 0
+
+    def flaky(n: int) -> int:
+        nonlocal count
+        count += 1
+        if count > calls:
+            raise RuntimeError("flaky")
+        return n
+
+    return flaky
+
+
+def test_every_function_is_timed_once_per_round():
+    runs = interleaved_timings({"a": double, "b": double}, 21, warmup=2, repeat=5)
+    for run in runs.values():
+        assert run["answer"] == "42"
+        assert run["error"] is None
+        assert len(run["timings"]) == 5
+
+
+def test_every_function_failing_during_warmup():
+    runs = interleaved_timings({"a": fail, "b": fail_after(1)}, 1, warmup=2, repeat=3)
+    assert all("Error" in run["error"] and run["timings"] == [] for run in runs.values())
+    assert runs["b"]["answer"] == "1"
+
+
+def test_a_failure_in_a_timed_round_drops_only_that_function():
+    runs = interleaved_timings({"a": double, "b": fail_after(3)}, 1, warmup=1, repeat=5)
+    assert runs["a"]["error"] is None
+    assert len(runs["a"]["timings"]) == 5
+    assert "RuntimeError: flaky" in runs["b"]["error"]
+    assert len(runs["b"]["timings"]) == 2  # the warmup call, then two timed rounds
+
+
+def benchmark_record(part: int, answer: str, median_ns: int) -> dict:
+    return {"year": 2024, "day": 7, "part": part, "input": "puzzle.txt", "input_sha256": "abc", "error": None,
+            "answer": answer, "timestamp": "2024-12-07T00:00:00+00:00", "solve": {"median_ns": median_ns}}
+
+
+def test_compare_counts_slower_and_changed_answers_as_regressions(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+    save_baseline(path, [benchmark_record(1, "3749", 10_000_000), benchmark_record(2, "11387", 10_000_000)])
+    baseline = load_baseline(path)
+    assert compare_to_baseline([benchmark_record(1, "3749", 10_500_000)], baseline, 0.1, 1_000_000) == 0
+    assert compare_to_baseline([benchmark_record(1, "3749", 20_000_000)], baseline, 0.1, 1_000_000) == 1
+    assert compare_to_baseline([benchmark_record(2, "11388", 10_000_000)], baseline, 0.1, 1_000_000) == 1
+    assert "answer changed: 11387 -> 11388" in capsys.readouterr().out
@@ -0,0 +1,41 @@
+import asyncio
+import json
+from contextlib import suppress
+
+from runner import daemon
+
+
+async def exchange(socket_path, requests: list[dict]) -> list[dict]:
+    """Starts a daemon with one worker, pipelines the requests on one connection and returns every response."""
+    server = asyncio.create_task(daemon.serve(socket_path, 1, 8, 100, False))
+    while not socket_path.exists():
+        assert not server.done(), server.exception()
+        await asyncio.sleep(0.01)
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(socket_path))
+        writer.write(b"".join(json.dumps(request).encode() + b"\n" for request in requests))
+        await writer.drain()
+        writer.write_eof()
+        responses = [json.loads(line) async for line in reader]
+        writer.close()
+        return responses
+    finally:
+        server.cancel()
+        with suppress(asyncio.CancelledError):
+            await server
+
+
+def test_large_inline_inputs(tmp_path, monkeypatch):
+    monkeypatch.setattr(daemon, "MAX_REQUEST_BYTES", 1 << 20)
+    rotations = "R5\n" * 200_000  # 600 KB, well past asyncio's default 64 KiB line limit
+    request = {"year": 2025, "day": 1, "part": 1, "input": rotations}
+    responses = asyncio.run(exchange(tmp_path / "aoc.sock", [
+        {"id": 1, **request},
+        {"id": 2, **request, "input": rotations * 2},  # over the limit
+        {"id": 3, **request},
+    ]))
+    assert len(responses) == 3
+    answers = sorted((r["id"], r["answer"]) for r in responses if "id" in r)
+    assert answers == [(1, "10000"), (3, "10000")]
+    [rejected] = [r for r in responses if "id" not in r]
+    assert rejected == {"ok": False, "error": "bad request: longer than 1,048,576 bytes"}
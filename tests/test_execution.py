@@ -0,0 +1,64 @@
+import operator
+import os
+import shutil
+
+import pytest
+from runner import SRC_DIR
+from runner.execution import _IsolatedWorker
+from runner.solutions import get_solution
+
+from aoc_utils import map_reduce
+
+
+def square(n: int) -> int:
+    return n * n
+
+
+def sum_of_squares(unit: tuple[int, int, str, int]) -> dict:
+    """A stand-in for run_unit that fans out to a pool unless map_reduce notices it can't."""
+    n = unit[3]
+    return {
+        "explicit_workers": map_reduce(range(n), square, operator.add, 0, workers=2, parallel=True),
+        "default_workers": map_reduce(range(n), square, operator.add, 0, parallel=True),
+        "max_workers_env": os.environ.get("AOC_MAX_WORKERS"),
+    }
+
+
+def test_map_reduce_runs_serially_in_an_isolated_worker():
+    worker = _IsolatedWorker()
+    try:
+        result = worker.run(sum_of_squares, (2022, 19, "example.txt", 50), timeout=60)
+    finally:
+        worker.close()
+    expected = sum(n * n for n in range(50))
+    assert result == {"explicit_workers": expected, "default_workers": expected, "max_workers_env": "1"}
+
+
+@pytest.fixture
+def slow_import_day():
+    """A throwaway day whose solution takes half a second to import and no time to solve."""
+    year_dir = SRC_DIR / "aoc_1900"
+    (year_dir / "day_01").mkdir(parents=True)
+    (year_dir / "day_01" / "solution.py").write_text(
+        "import time\n\ntime.sleep(0.5)\n\n\n"
+        "def solve_part_1(puzzle_input):\n    return 1\n\n\n"
+        "def solve_part_2(puzzle_input):\n    return 2\n"
+    )
+    try:
+        yield 1900, 1
+    finally:
+        shutil.rmtree(year_dir)
+
+
+def solve_unit(unit: tuple[int, int, str, int]) -> dict:
+    year, day, _, part = unit
+    return {"answer": get_solution(year, day)[part - 1]([])}
+
+
+def test_imports_do_not_count_against_the_time_budget(slow_import_day):
+    worker = _IsolatedWorker()
+    try:
+        results = [worker.run(solve_unit, (*slow_import_day, "example.txt", part), timeout=0.3) for part in (1, 2)]
+    finally:
+        worker.close()
+    assert results == [{"answer": 1}, {"answer": 2}]
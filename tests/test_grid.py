@@ -0,0 +1,331 @@
+import numpy as np
+import pytest
+
+from aoc_utils import Grid, SparseGrid
+from aoc_utils.Grid import EMPTY, not_wall, passable_table
+
+ROWS = [
+    "#.#..",
+    "..#.#",
+    "#....",
+    ".##.#",
+]
+
+
+def test_cells_are_a_flat_row_major_bytearray():
+    g = Grid.from_puzzle_input(["ab", "cd"])
+    assert isinstance(g.cells, bytearray)
+    assert g.cells == bytearray(b"abcd")
+    assert (g.height, g.width) == (2, 2)
+    assert g.at(1, 0) == "c"
+
+
+def test_short_rows_leave_cells_unset():
+    g = Grid.from_puzzle_input(["abc", "d"])
+    assert g.width == 3
+    assert g.cells == bytearray(b"abcd\0\0")
+    assert g.in_bounds(1, 0)
+    assert not g.in_bounds(1, 1)
+    with pytest.raises(KeyError):
+        g.at(1, 1)
+    assert list(g) == [(0, 0), (0, 1), (0, 2), (1, 0)]
+
+
+@pytest.mark.parametrize("cls", [Grid, SparseGrid])
+def test_trailing_blank_lines_are_not_rows(cls):
+    g = cls.from_puzzle_input(["ab", "", "cd", "", ""])
+    assert (g.height, g.width) == (3, 2)  # the blank line between rows still is one
+    assert list(g.neighbors((2, 0), allow_wrap_around=True)) == [(3, 0), (2, 1), (2, -1)]
+    assert (cls.from_puzzle_input(["", ""]).height, cls.from_puzzle_input([]).height) == (0, 0)
+
+
+def test_fill():
+    assert Grid(2, 3, ".").cells == bytearray(b"......")
+    assert Grid(2, 3).cells == bytearray(6)
+    assert list(Grid(2, 3)) == []
+
+
+def test_set_grows_towards_positive_indices():
+    g = Grid.from_puzzle_input(["ab", "cd"])
+    g.set(3, 2, "x")
+    assert (g.height, g.width) == (4, 3)
+    assert g.cells == bytearray(b"ab\0cd\0\0\0\0\0\0x")
+    assert g.at(0, 1) == "b"
+    assert g.at(1, 1) == "d"
+    assert g.at(3, 2) == "x"
+    assert not g.in_bounds(2, 0)
+    with pytest.raises(IndexError):
+        g.set(-1, 0, "x")
+
+
+def test_set_rejects_values_a_byte_cannot_hold():
+    g = Grid(1, 1)
+    for val in ("ab", "", "€", 1):
+        with pytest.raises(TypeError):
+            g.set(0, 0, val)
+    assert g.count("ab") == 0
+    assert g.where("ab") == []
+
+
+def test_values_count_equality_repeat_and_repr():
+    g = Grid.from_puzzle_input(ROWS)
+    assert g.values == {(i, j): val for i, row in enumerate(ROWS) for j, val in enumerate(row)}
+    assert g.count("#") == 8
+    assert g == Grid.from_puzzle_input(ROWS)
+    assert g != Grid.from_puzzle_input(ROWS[:-1])
+    assert repr(g) == "\n".join(ROWS)
+    assert repr(g.repeat(2, 3)) == "\n".join(row * 3 for row in ROWS * 2)
+
+
+class TestSparseGridParity:
+    """SparseGrid must answer every query the way Grid does on the same rows."""
+
+    @pytest.fixture
+    def grids(self):
+        return Grid.from_puzzle_input(ROWS), SparseGrid.from_puzzle_input(ROWS)
+
+    def test_cells(self, grids):
+        g, s = grids
+        assert (s.height, s.width) == (g.height, g.width)
+        assert s.values == g.values
+        assert s == g
+        assert repr(s) == repr(g)
+        assert list(s) == list(g)
+        assert list(s.iter_cells()) == list(g.iter_cells())
+        assert list(s.iter_indices()) == list(g.iter_indices())
+        assert s.count("#") == g.count("#")
+        assert s.where("#") == g.where("#")
+        assert all(s.in_bounds(i, j) == g.in_bounds(i, j) for i in range(-1, 6) for j in range(-1, 7))
+
+    def test_numpy(self, grids):
+        g, s = grids
+        assert (s.to_numpy() == g.to_numpy()).all()
+        assert (s.count_neighbors("#") == g.count_neighbors("#")).all()
+        mask = g.to_numpy() == ord(".")
+        assert s.where(mask=mask) == g.where(mask=mask)
+        assert SparseGrid.from_numpy(g.to_numpy()) == g
+
+    @pytest.mark.parametrize("connectivity", [4, 8])
+    @pytest.mark.parametrize("passable", [None, "#", lambda val: val == "."])
+    def test_searches(self, grids, connectivity, passable):
+        g, s = grids
+        kwargs = {"connectivity": connectivity} | ({} if passable is None else {"passable": passable})
+        for point in [(i, j) for i in range(-1, 5) for j in range(-1, 6)]:
+            assert list(s.neighbors(point, **kwargs)) == list(g.neighbors(point, **kwargs))
+            assert (list(s.neighbors(point, allow_wrap_around=True, **kwargs)) ==
+                    list(g.neighbors(point, allow_wrap_around=True, **kwargs)))
+        assert s.adjacency(**kwargs) == g.adjacency(**kwargs)
+        source = (2, 1) if passable != "#" else (0, 0)
+        dist = g.bfs(source, **kwargs)
+        assert s.bfs(source, **kwargs) == {(i, j): int(d) for (i, j), d in np.ndenumerate(dist) if d >= 0}
+        assert s.dijkstra((2, 1)) == g.dijkstra((2, 1))
+
+    def test_set_and_repeat(self, grids):
+        g, s = grids
+        g.set(1, 1, "#")
+        s.set(1, 1, "#")
+        assert s == g
+        assert s.repeat(2, 2) == g.repeat(2, 2)
+
+    def test_dense_only_internals_are_replaced(self, grids):
+        _, s = grids
+        assert not hasattr(s, "cells")
+        s.invalidate_adjacency()
+        with pytest.raises(NotImplementedError):
+            s._grow(10, 10)
+        s.set(-1, -1, "x")  # negative coordinates are fine, and left out of the dense views
+        assert s.at(-1, -1) == "x"
+        assert s.to_numpy().shape == (4, 5)
+
+
+def test_numpy_round_trip():
+    g = Grid.from_puzzle_input(["ab", "c"])
+    array = g.to_numpy()
+    assert array.dtype == np.uint8
+    assert array.tolist() == [[ord("a"), ord("b")], [ord("c"), 0]]
+    assert Grid.from_numpy(array) == g
+    assert Grid.from_numpy(np.array([["a", "b"], ["c", ""]])) == g
+    with pytest.raises(ValueError):
+        Grid.from_numpy(np.zeros(3))
+    with pytest.raises(ValueError):
+        Grid.from_numpy(np.array([[256]]))
+
+
+def test_to_numpy_is_a_view_until_the_grid_grows():
+    g = Grid.from_puzzle_input(["..", ".."])
+    array = g.to_numpy()
+    array[0, 1] = ord("#")
+    assert g.at(0, 1) == "#"
+    g.set(1, 0, "x")
+    assert array[1, 0] == ord("x")
+    g.set(2, 2, "y")  # moves the grid to a new buffer, leaving the old view behind
+    assert g.at(2, 2) == "y"
+    assert array.shape == (2, 2)
+
+
+def test_count_neighbors():
+    g = Grid.from_puzzle_input(["@@.", "@.@", "..."])
+    assert g.count_neighbors("@").tolist() == [[2, 3, 2], [2, 4, 1], [1, 2, 1]]
+    assert g.count_neighbors("@", stencil=((0, 1, 0), (1, 0, 1), (0, 1, 0))).tolist() == [
+        [2, 1, 2], [1, 3, 0], [1, 0, 1]]
+    assert g.count_neighbors("x").sum() == 0
+    with pytest.raises(ValueError):
+        g.count_neighbors("@", stencil=((1, 1), (1, 1)))
+
+
+def test_set_many():
+    g = Grid.from_puzzle_input(["@@.", "@.@"])
+    g.set_many(g.to_numpy() == ord("@"), "x")
+    assert repr(g) == "xx.\nx.x"
+    with pytest.raises(TypeError):
+        g.set_many(g.to_numpy() == ord("x"), "xy")
+
+
+def test_where():
+    g = Grid.from_puzzle_input(ROWS)
+    walls = [(i, j) for i, row in enumerate(ROWS) for j, val in enumerate(row) if val == "#"]
+    assert g.where("#") == walls
+    mask = np.zeros((g.height, g.width), dtype=bool)
+    mask[:2] = True
+    assert g.where("#", mask=mask) == [p for p in walls if p[0] < 2]
+    assert g.where(mask=mask) == [(i, j) for i in range(2) for j in range(g.width)]
+    assert all(type(i) is int for point in g.where(mask=mask) for i in point)
+
+
+MAZE = [
+    "#######",
+    "#S....#",
+    "#.###.#",
+    "#...#E#",
+    "#######",
+]
+
+
+def test_bfs_single_source():
+    g = Grid.from_puzzle_input(MAZE)
+    dist = g.bfs((1, 1))
+    assert dist.shape == (g.height, g.width)
+    assert dist[1, 1] == 0
+    assert dist[3, 5] == 6
+    assert dist[3, 3] == 4
+    assert dist[0, 0] == -1  # walls are never reached
+
+
+def test_multi_source_bfs_gives_the_distance_to_the_nearest_source():
+    g = Grid.from_puzzle_input(MAZE)
+    sources = [(1, 1), (3, 5)]
+    dist = g.bfs(sources)
+    unreached = np.iinfo(np.int64).max
+    nearest = np.minimum(*(np.where(d == -1, unreached, d) for d in map(g.bfs, sources)))
+    assert (dist == np.where(nearest == unreached, -1, nearest)).all()
+    assert dist[1, 3] == 2
+    assert dist[2, 5] == 1
+
+
+def test_bfs_stops_at_the_target_and_at_max_dist():
+    g = Grid.from_puzzle_input(MAZE)
+    dist = g.bfs((1, 1), target=(1, 3))
+    assert dist[1, 3] == 2
+    assert dist[3, 5] == -1  # beyond the target, never reached
+    dist = g.bfs([(1, 1), (3, 5)], target=(1, 4))
+    assert dist[1, 4] == 3
+    dist = g.bfs((1, 1), max_dist=2)
+    assert dist.max() == 2
+    assert dist[1, 4] == -1
+
+
+def test_bfs_connectivity_and_passable():
+    g = Grid.from_puzzle_input(["..#", "#.#", "#.."])
+    assert g.bfs((0, 0), connectivity=8)[2, 2] == 2
+    assert g.bfs((0, 0))[2, 2] == 4
+    assert g.bfs((0, 0), passable=".")[2, 2] == 4
+    assert g.bfs((0, 0), passable=lambda val: True)[0, 2] == 2
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"sources": (0, 7)},
+    {"sources": (-1, 1)},
+    {"sources": [(1, 1), (5, 1)]},
+    {"sources": (1, 1), "target": (1, 7)},
+    {"sources": (1, 1), "target": (9, 9)},
+])
+def test_bfs_rejects_points_outside_the_grid(kwargs):
+    for g in (Grid.from_puzzle_input(MAZE), SparseGrid.from_puzzle_input(MAZE)):
+        with pytest.raises(IndexError):
+            g.bfs(**kwargs)
+
+
+def test_adjacency_lists_passable_neighbors_in_csr_form():
+    g = Grid.from_puzzle_input(["..#", ".#."])
+    offsets, indices = g.adjacency()
+    assert len(offsets) == g.height * g.width + 1
+    for k in range(g.height * g.width):
+        expected = [i * g.width + j for i, j in Grid.neighbors(g, divmod(k, g.width), allow_wrap_around=False)]
+        assert sorted(indices[offsets[k]:offsets[k + 1]]) == sorted(expected)
+
+
+def test_set_drops_only_adjacency_tables_whose_passability_changes():
+    g = Grid.from_puzzle_input(["...", ".#.", "..."])
+    g.adjacency()
+    g.adjacency(connectivity=8)
+    g.adjacency(passable="#")
+    g.set(0, 0, "x")  # passable for not_wall, not for "#"
+    assert len(g._adjacency) == 3
+    g.set(0, 1, "#")
+    assert len(g._adjacency) == 0
+    assert list(g.neighbors((0, 0))) == [(1, 0)]
+    assert g.bfs((0, 0), connectivity=8)[0, 2] == 4  # around the wall column
+
+
+def test_invalidate_adjacency_after_writing_through_to_numpy():
+    g = Grid.from_puzzle_input(["...", "..."])
+    g.adjacency()
+    g.to_numpy()[0, 1] = ord("#")
+    g.invalidate_adjacency()
+    assert list(g.neighbors((0, 0))) == [(1, 0)]
+
+
+def test_passable_table():
+    table = passable_table(lambda val: val in ".S")
+    assert len(table) == 256
+    assert table[ord(".")] and table[ord("S")] and not table[ord("#")]
+    assert not table[EMPTY]
+    assert passable_table(table) is table
+    assert passable_table(not_wall) is passable_table(not_wall)  # cached by the predicate object
+    assert passable_table(".S") == table
+    with pytest.raises(ValueError):
+        passable_table(b"too short")
+
+
+def test_neighbors_and_searches_accept_a_passable_table():
+    g = Grid.from_puzzle_input(["S.#", "#.E"])
+    table = passable_table(".SE")
+    assert list(g.neighbors((0, 1), passable=table)) == list(g.neighbors((0, 1), passable=".SE"))
+    assert g.adjacency(passable=table) == g.adjacency(passable=".SE")
+    assert len(g._adjacency) == 1  # equal tables share one adjacency table
+    assert g.bfs((0, 0), passable=table)[1, 2] == 3
+
+
+def row_major(grid) -> list[tuple[int, int]]:
+    return sorted((i, j) for i in range(grid.height) for j in range(grid.width) if grid.in_bounds(i, j))
+
+
+@pytest.mark.parametrize("rows", [ROWS, ["ab", "c", "", "defg"]])
+@pytest.mark.parametrize("cls", [Grid, SparseGrid])
+def test_iteration_is_row_major_over_set_cells(cls, rows):
+    g = cls.from_puzzle_input(rows)
+    points = row_major(g)
+    assert list(g) == points
+    assert list(g.iter_cells()) == [(i, j, rows[i][j]) for i, j in points]
+    assert list(g.iter_indices()) == [i * g.width + j for i, j in points]
+
+
+@pytest.mark.parametrize("cls", [Grid, SparseGrid])
+def test_iteration_includes_cells_added_by_growth(cls):
+    g = cls.from_puzzle_input(["ab", "cd"])
+    assert list(g) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+    g.set(3, 1, "e")
+    g.set(0, 3, "f")
+    assert list(g) == [(0, 0), (0, 1), (0, 3), (1, 0), (1, 1), (3, 1)]
+    assert [val for _, _, val in g.iter_cells()] == ["a", "b", "f", "c", "d", "e"]
+    assert list(g.iter_indices()) == [0, 1, 3, 4, 5, 13]
@@ -0,0 +1,34 @@
+from aoc_utils import Grid, SparseGrid
+from aoc_utils.instrumentation import counting
+
+
+def test_grid_cell_reads_and_writes():
+    g = Grid.from_puzzle_input(["ab", "cd"])
+    with counting() as counts:
+        g.at(0, 0)
+        g.set(1, 1, "x")
+        list(g.neighbors((0, 0)))
+    assert counts == {"grid reads": 1, "grid writes": 1, "neighbor expansions": 2}
+
+
+def test_bulk_grid_operations():
+    g = Grid.from_puzzle_input(["@.@", "@@.", "..."])
+    with counting() as counts:
+        mask = g.to_numpy() == ord("@")
+        g.count_neighbors("@")
+        g.set_many(mask, ".")
+        g.where("@")
+    assert counts["grid writes"] == 4
+    assert counts["grid cells scanned"] == 2 * 9
+    assert counts["grid numpy views"] >= 1
+    assert "grid reads" not in counts
+
+
+def test_sparse_grid_bulk_writes_are_counted_once():
+    g = SparseGrid.from_puzzle_input(["@.", ".@"])
+    with counting() as counts:
+        g.set_many(g.to_numpy() == ord("@"), ".")
+        g.count(".")
+    assert counts["grid writes"] == 2
+    assert counts["grid cells scanned"] == 4
+
@@ -0,0 +1,99 @@
+import pytest
+
+from aoc_utils import clear_memos, memo_scope, memo_stats, memoize
+
+
+@pytest.fixture(autouse=True)
+def cold_memos():
+    clear_memos()
+    yield
+    clear_memos()
+
+
+@pytest.mark.parametrize("key", [None, lambda n: n])
+def test_bounded_cache_evicts_least_recently_used(key):
+    calls = []
+
+    @memoize(max_entries=2, key=key)
+    def square(n):
+        calls.append(n)
+        return n * n
+
+    assert [square(1), square(2), square(1), square(3)] == [1, 4, 1, 9]  # 3 evicts 2, the least recently used
+    assert square(1) == 1
+    assert square(2) == 4
+    assert calls == [1, 2, 3, 2]
+    info = square.cache_info()
+    assert info["size"] == 2
+    assert info["max_entries"] == 2
+    assert (info["hits"], info["misses"], info["evictions"]) == (2, 4, 2)
+
+
+def test_unbounded_cache_never_evicts():
+    @memoize(max_entries=None)
+    def double(n):
+        return 2 * n
+
+    for n in range(100):
+        double(n)
+    assert double.cache_info()["size"] == 100
+    assert double.cache_info()["evictions"] == 0
+
+
+def test_custom_key_makes_unhashable_arguments_hashable():
+    calls = []
+
+    @memoize(key=lambda design, patterns: (design, frozenset(patterns)))
+    def num_ways(design, patterns):
+        calls.append(design)
+        return len(design) + len(patterns)
+
+    assert num_ways("ab", ["x"]) == 3
+    assert num_ways("ab", ["x"]) == 3
+    assert num_ways("ab", ["x", "y"]) == 4  # different patterns aren't served from the cache
+    assert calls == ["ab", "ab"]
+
+
+def test_memo_scope_clears_on_entry_and_exit_and_reports_stats():
+    calls = []
+
+    @memoize
+    def fib(n):
+        calls.append(n)
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    fib(10)
+    with memo_scope() as stats:
+        assert fib.cache_info()["size"] == 0  # cleared on entry
+        assert fib(10) == 55
+    assert calls.count(10) == 2
+    assert stats[fib.__qualname__]["misses"] == 11
+    assert stats[fib.__qualname__]["hits"] == 8
+    assert fib.cache_info()["size"] == 0  # cleared on exit
+    assert memo_stats() == {}
+
+
+def test_memo_scope_clears_after_an_exception():
+    @memoize
+    def identity(n):
+        return n
+
+    with pytest.raises(ValueError), memo_scope():
+        identity(1)
+        raise ValueError
+    assert identity.cache_info()["size"] == 0
+
+
+def test_memo_stats_only_lists_used_functions():
+    @memoize
+    def used(n):
+        return n
+
+    @memoize(key=lambda n: n)
+    def unused(n):
+        return n
+
+    used(1)
+    used(1)
+    assert list(memo_stats()) == [used.__qualname__]
+    assert memo_stats()[used.__qualname__]["hits"] == 1
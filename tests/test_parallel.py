@@ -0,0 +1,74 @@
+import operator
+
+import pytest
+
+import aoc_utils.parallel as parallel
+from aoc_utils import map_reduce
+
+
+def square(n: int) -> int:
+    return n * n
+
+
+def fail_on_seven(n: int) -> int:
+    if n == 7:
+        raise ValueError(f"bad record {n}")
+    return n
+
+
+@pytest.fixture
+def pool_calls(monkeypatch):
+    """Records the records each map_reduce call sends to a pool, while still running them there."""
+    calls = []
+    map_parallel = parallel._map_parallel
+
+    def recording(records, fn, workers, chunk_size):
+        calls.append(list(records))
+        return map_parallel(records, fn, workers, chunk_size)
+
+    monkeypatch.setattr(parallel, "_map_parallel", recording)
+    return calls
+
+
+def test_matches_serial_reduce():
+    assert map_reduce(range(10), square, operator.add, 0) == sum(n * n for n in range(10))
+    assert map_reduce(range(1, 5), square, operator.mul) == 576
+    assert map_reduce([], square, operator.add, 0) == 0
+
+
+def test_results_are_reduced_in_record_order(pool_calls):
+    records = [str(n) for n in range(50)]
+    result = map_reduce(records, str.upper, operator.add, "", workers=3, chunk_size=4, parallel=True)
+    assert result == "".join(records)
+    assert pool_calls == [records]
+
+
+def test_cheap_records_stay_serial(pool_calls):
+    assert map_reduce(range(400), square, operator.add, 0, workers=2) == sum(n * n for n in range(400))
+    assert pool_calls == []
+
+
+def test_probe_sends_the_remaining_records_to_a_pool(monkeypatch, pool_calls):
+    monkeypatch.setattr(parallel, "PROBE_SECONDS", 0.0)
+    monkeypatch.setattr(parallel, "MIN_PARALLEL_SECONDS", 0.0)
+    assert map_reduce(range(20), square, operator.add, 0, workers=2) == sum(n * n for n in range(20))
+    assert pool_calls == [list(range(1, 20))]  # the probed first record isn't run twice
+
+
+@pytest.mark.parametrize("kwargs", [{"parallel": False}, {"workers": 1, "parallel": True}])
+def test_serial_fallback(pool_calls, kwargs):
+    assert map_reduce(range(20), square, operator.add, 0, **kwargs) == sum(n * n for n in range(20))
+    assert pool_calls == []
+
+
+def test_max_workers_from_the_environment(monkeypatch, pool_calls):
+    monkeypatch.setenv("AOC_MAX_WORKERS", "1")
+    assert parallel.max_workers() == 1
+    assert map_reduce(range(20), square, operator.add, 0, parallel=True) == sum(n * n for n in range(20))
+    assert pool_calls == []
+
+
+@pytest.mark.parametrize("kwargs", [{"parallel": False}, {"workers": 2, "parallel": True}])
+def test_exceptions_propagate(kwargs):
+    with pytest.raises(ValueError, match="bad record 7"):
+        map_reduce(range(10), fail_on_seven, operator.add, 0, **kwargs)
@@ -0,0 +1,22 @@
+import time
+
+from runner.profiling import _track_memory
+
+
+def test_allocation_sites_come_from_near_the_peak():
+    with _track_memory(sample_interval=0.001) as stats:
+        big = [bytes(1 << 16) for _ in range(64)]  # 4 MiB, freed before the block ends
+        time.sleep(0.05)
+        del big
+    assert stats["peak_traced_bytes"] >= 4 << 20
+    assert stats["sites_taken"] == "near peak"
+    assert stats["sites_traced_bytes"] >= 4 << 20
+    assert stats["top_sites"][0]["size_bytes"] >= 4 << 20
+    assert stats["top_sites"][0]["site"].startswith(f"{__file__}:")
+
+
+def test_short_blocks_are_labelled_as_snapshotted_on_exit():
+    with _track_memory(sample_interval=60) as stats:
+        kept = [bytes(1 << 10) for _ in range(4)]
+    assert stats["sites_taken"] == "on exit"
+    assert stats["sites_traced_bytes"] >= len(kept) << 10
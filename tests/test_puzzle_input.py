@@ -0,0 +1,105 @@
+import mmap
+import sys
+
+import pytest
+
+from aoc_utils import PuzzleInput
+from aoc_utils.PuzzleInput import ITER_BATCH
+
+
+def from_file(tmp_path, data: bytes) -> PuzzleInput:
+    path = tmp_path / "input.txt"
+    path.write_bytes(data)
+    return PuzzleInput.from_file(path)
+
+
+def test_from_file_memory_maps_the_file(tmp_path):
+    lines = from_file(tmp_path, b"abc\ndef\n")
+    assert isinstance(lines._buffer, mmap.mmap)
+    assert list(lines) == ["abc", "def"]
+
+
+@pytest.mark.parametrize("data", [
+    b"abc\ndef\n",
+    b"abc\ndef",
+    b"abc\n\ndef\n\n",
+    b"\n",
+    b"\n\n",
+    b"single",
+])
+def test_lines_match_splitlines(tmp_path, data):
+    lines = from_file(tmp_path, data)
+    expected = data.decode().splitlines()
+    assert len(lines) == len(expected)
+    assert list(lines) == expected
+    assert [lines[i] for i in range(len(lines))] == expected
+    assert lines == expected
+
+
+def test_empty_file(tmp_path):
+    lines = from_file(tmp_path, b"")
+    assert len(lines) == 0
+    assert list(lines) == []
+    assert bytes(lines.raw) == b""
+    with pytest.raises(IndexError):
+        lines[0]
+
+
+def test_trailing_newline_does_not_add_an_empty_line(tmp_path):
+    assert list(from_file(tmp_path, b"a\nb\n")) == ["a", "b"]
+    assert list(from_file(tmp_path, b"a\nb\n\n")) == ["a", "b", ""]
+    assert bytes(from_file(tmp_path, b"a\nb\n").raw) == b"a\nb"
+
+
+def test_crlf_line_endings_are_stripped(tmp_path):
+    lines = from_file(tmp_path, b"ab\r\ncd\r\n\r\nef")
+    assert list(lines) == ["ab", "cd", "", "ef"]
+    assert lines[1] == "cd"
+    assert lines.line_bytes(0) == b"ab"
+    assert lines[-1] == "ef"
+
+
+def test_negative_indices_and_out_of_range():
+    lines = PuzzleInput.from_bytes(b"a\nb\nc\n")
+    assert lines[-1] == "c"
+    assert lines[-3] == "a"
+    with pytest.raises(IndexError):
+        lines[3]
+    with pytest.raises(IndexError):
+        lines[-4]
+
+
+def test_slices_share_the_buffer():
+    lines = PuzzleInput.from_bytes(b"a\nb\nc\nd\n")
+    middle = lines[1:3]
+    assert isinstance(middle, PuzzleInput)
+    assert middle._buffer is lines._buffer
+    assert list(middle) == ["b", "c"]
+    assert bytes(middle.raw) == b"b\nc"
+    assert list(lines[3:1]) == []
+    assert lines[::2] == ["a", "c"]
+
+
+def test_many_lines_across_iteration_batches():
+    expected = [f"line {i}" * (i % 7) for i in range(ITER_BATCH * 3 + 5)]
+    data = ("\n".join(expected) + "\n").encode()
+    lines = PuzzleInput.from_bytes(data)
+    assert list(lines) == expected
+    assert lines[ITER_BATCH] == expected[ITER_BATCH]
+
+
+def test_lines_longer_than_a_chunk(monkeypatch):
+    # the package's PuzzleInput attribute is the class, so patch the module through sys.modules
+    monkeypatch.setattr(sys.modules["aoc_utils.PuzzleInput"], "CHUNK_SIZE", 8)
+    expected = ["a" * 20, "bc", "", "d" * 9, "e"]
+    lines = PuzzleInput.from_bytes("\n".join(expected).encode())
+    assert list(lines) == expected
+
+
+def test_concatenation_and_equality():
+    lines = PuzzleInput.from_bytes(b"a\nb\n")
+    assert lines + ["c"] == ["a", "b", "c"]
+    assert ["z"] + lines == ["z", "a", "b"]
+    assert lines == ("a", "b")
+    assert lines != "ab"
+    assert lines != ["a"]